@@ -0,0 +1,45 @@
+"""Covering index for short code lookups
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-15 09:00:00.000000
+
+This migration rebuilds idx_short_code as a covering index that includes
+original_url, so redirect lookups can be answered by an index-only scan
+without visiting the heap.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Recreate idx_short_code with INCLUDE (original_url).
+    
+    Index-only scans depend on an up-to-date visibility map, so autovacuum
+    is also tuned to vacuum the urls table more eagerly.
+    """
+    op.drop_index('idx_short_code', table_name='urls')
+    op.create_index(
+        'idx_short_code',
+        'urls',
+        ['short_code'],
+        unique=True,
+        postgresql_include=['original_url'],
+    )
+    op.execute("ALTER TABLE urls SET (autovacuum_vacuum_scale_factor = 0.05)")
+
+
+def downgrade() -> None:
+    """Restore the plain idx_short_code index and default autovacuum settings."""
+    op.execute("ALTER TABLE urls RESET (autovacuum_vacuum_scale_factor)")
+    op.drop_index('idx_short_code', table_name='urls')
+    op.create_index('idx_short_code', 'urls', ['short_code'], unique=True)
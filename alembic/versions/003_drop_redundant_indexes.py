@@ -0,0 +1,39 @@
+"""Drop redundant URL indexes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15 10:00:00.000000
+
+Migration 001 created unique indexes on top of unique constraints over the
+same columns, so every insert maintained two identical btrees per column.
+This migration keeps exactly one unique index per column:
+- original_url: the urls_original_url_key constraint (idx_original_url dropped)
+- short_code: the covering idx_short_code index (urls_short_code_key dropped)
+
+idx_short_code_created is dropped as well: its leading column is unique, so
+it can never serve a query that idx_short_code does not.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop indexes and constraints that duplicate another unique btree."""
+    op.drop_index('idx_original_url', table_name='urls')
+    op.drop_index('idx_short_code_created', table_name='urls')
+    op.drop_constraint('urls_short_code_key', 'urls', type_='unique')
+
+
+def downgrade() -> None:
+    """Recreate the redundant indexes and constraint."""
+    op.create_unique_constraint('urls_short_code_key', 'urls', ['short_code'])
+    op.create_index('idx_short_code_created', 'urls', ['short_code', 'created_at'])
+    op.create_index('idx_original_url', 'urls', ['original_url'], unique=True)
@@ -0,0 +1,44 @@
+"""Byte-wise collation for short codes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15 11:00:00.000000
+
+Short codes are 5 ASCII Base62 characters compared case-sensitively, so
+locale-aware collation only adds cost: every btree comparison in
+idx_short_code went through strcoll. With COLLATE "C" the column is compared
+with memcmp, which is what the codes mean anyway. Changing the collation
+rebuilds the index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Switch urls.short_code to the C collation."""
+    op.alter_column(
+        'urls',
+        'short_code',
+        existing_type=sa.String(length=5),
+        type_=sa.String(length=5, collation='C'),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    """Restore the database default collation on urls.short_code."""
+    op.alter_column(
+        'urls',
+        'short_code',
+        existing_type=sa.String(length=5, collation='C'),
+        type_=sa.String(length=5),
+        existing_nullable=False,
+    )
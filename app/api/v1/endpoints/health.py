@@ -4,17 +4,23 @@ Health Check Endpoint Module.
 Provides endpoints for monitoring application health and service status.
 """
 
-from datetime import datetime
+import asyncio
+import time
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.dependencies import get_database_session
 from app.core.redis import redis_manager
 from app.schemas.url import HealthCheckResponse
 
 router = APIRouter()
 
+# Last healthy result as (monotonic timestamp, response)
+_last_check: tuple[float, HealthCheckResponse] | None = None
+
 
 @router.get(
     "/health",
@@ -32,18 +38,27 @@ async def health_check(
     - Database connection
     - Redis connection
     
+    Both checks run concurrently. A healthy result is reused for
+    HEALTH_CHECK_CACHE_TTL seconds so frequent liveness probes do not
+    take a database connection on every call.
+    
     Returns:
         HealthCheckResponse: Health status of all services
     """
-    # Check database connection
-    db_status = "connected"
-    try:
-        await db.execute(text("SELECT 1"))
-    except Exception:
-        db_status = "disconnected"
+    global _last_check
     
-    # Check Redis connection
-    redis_status = "connected" if await redis_manager.ping() else "disconnected"
+    now = time.monotonic()
+    if _last_check and now - _last_check[0] < settings.HEALTH_CHECK_CACHE_TTL:
+        return _last_check[1]
+    
+    # Check database and Redis connections concurrently
+    db_result, redis_result = await asyncio.gather(
+        db.execute(text("SELECT 1")),
+        redis_manager.ping(),
+        return_exceptions=True,
+    )
+    db_status = "disconnected" if isinstance(db_result, BaseException) else "connected"
+    redis_status = "connected" if redis_result is True else "disconnected"
     
     # Determine overall status
     overall_status = (
@@ -52,10 +67,15 @@ async def health_check(
         else "unhealthy"
     )
     
-    return HealthCheckResponse(
+    response = HealthCheckResponse(
         status=overall_status,
         database=db_status,
         redis=redis_status,
-        timestamp=datetime.utcnow()
+        # Only built on a cache miss; cached responses keep their own timestamp
+        timestamp=datetime.fromtimestamp(time.time_ns() / 1e9, tz=timezone.utc)
     )
-
+    
+    # Only cache healthy results so failures are re-checked immediately
+    _last_check = (now, response) if overall_status == "healthy" else None
+    
+    return response
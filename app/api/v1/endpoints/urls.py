@@ -5,16 +5,19 @@ Provides API endpoints for URL shortening, redirection, and statistics.
 """
 
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import BaseModel
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.url import URLCreateRequest, URLCreateResponse, URLStatsResponse
 from app.services.url_service import URLService
+from app.services.url_batch_writer import url_batch_writer
 from app.core.dependencies import get_database_session
 from app.core.redis import redis_manager
 from app.core.config import settings
 from app.core.exceptions import (
+    URLShortenerException,
     URLNotFoundException,
     InvalidURLException,
     URLTooLongException,
@@ -24,12 +27,79 @@ from app.core.exceptions import (
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Bound once so request paths skip the attribute lookup on logger
+_log = logger.log
+_error = logger.error
 
-def get_url_service(
-    db: AsyncSession = Depends(get_database_session)
-) -> URLService:
+# Short URL prefix, resolved once instead of on every request
+_SHORT_URL_PREFIX = settings.BASE_URL.rstrip("/") + "/"
+
+# Log level for expected client errors; other service errors log as ERROR
+_LOG_LEVELS = {
+    InvalidURLException: logging.WARNING,
+    URLTooLongException: logging.WARNING,
+    URLNotFoundException: logging.WARNING,
+}
+
+# Client-facing detail for server errors; internal messages such as the
+# failed database operation are only logged
+_SERVER_ERROR_DETAILS = {
+    ShortCodeGenerationException: "Unable to generate unique short code. Please try again.",
+}
+_SERVER_ERROR_DETAIL = "An unexpected error occurred"
+
+
+def _to_http_exception(exc: URLShortenerException) -> HTTPException:
     """
-    Dependency for URL service.
+    Log a service exception and convert it to an HTTPException.
+    
+    Args:
+        exc: Service exception carrying its own status code and message
+    
+    Returns:
+        HTTPException: Exception with the same status code; client errors
+        keep their message, server errors get a generic detail
+    """
+    _log(
+        _LOG_LEVELS.get(type(exc), logging.ERROR),
+        "%s: %s",
+        type(exc).__name__,
+        exc.message
+    )
+    detail = exc.message
+    if exc.status_code >= 500:
+        detail = _SERVER_ERROR_DETAILS.get(type(exc), _SERVER_ERROR_DETAIL)
+    return HTTPException(status_code=exc.status_code, detail=detail)
+
+
+def _json_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Serialize a response model straight to a JSON response.
+    
+    pydantic-core writes the JSON in one pass; returning a Response skips
+    FastAPI's re-validation of the model against response_model, which
+    is kept on the routes for the OpenAPI schema.
+    
+    Args:
+        model: Response model built from trusted service data
+        status_code: HTTP status code
+    
+    Returns:
+        Response: JSON response
+    """
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
+
+def _url_service(db: AsyncSession) -> URLService:
+    """
+    Build a URL service around a request's database session.
+    
+    Called directly by the endpoints instead of through a Depends chain, so
+    FastAPI resolves only the session dependency per request.
     
     Args:
         db: Database session
@@ -37,7 +107,11 @@ def get_url_service(
     Returns:
         URLService: Configured URL service instance
     """
-    return URLService(db_session=db, redis_manager=redis_manager)
+    return URLService(
+        db_session=db,
+        redis_manager=redis_manager,
+        batch_writer=url_batch_writer
+    )
 
 
 @router.post(
@@ -49,8 +123,8 @@ def get_url_service(
 )
 async def shorten_url(
     request: URLCreateRequest,
-    url_service: URLService = Depends(get_url_service)
-) -> URLCreateResponse:
+    db: AsyncSession = Depends(get_database_session)
+) -> Response:
     """
     Create a shortened URL.
     
@@ -59,51 +133,38 @@ async def shorten_url(
     
     Args:
         request: URL shortening request containing the original URL
-        url_service: URL service instance
+        db: Database session
         
     Returns:
-        URLCreateResponse: Created short URL with metadata
+        Response: URLCreateResponse JSON with the short URL and metadata
         
     Raises:
         HTTPException: 400 for invalid URL, 500 for server errors
     """
     try:
         # Create short URL
-        url = await url_service.create_short_url(str(request.original_url))
+        url = await _url_service(db).create_short_url(str(request.original_url))
         
         # Build short URL
-        short_url = f"{settings.BASE_URL}/{url.short_code}"
+        short_url = _SHORT_URL_PREFIX + url.short_code
         
-        return URLCreateResponse(
-            short_code=url.short_code,
-            short_url=short_url,
-            original_url=url.original_url,
-            created_at=url.created_at
+        return _json_response(
+            URLCreateResponse.model_construct(
+                short_code=url.short_code,
+                short_url=short_url,
+                original_url=url.original_url,
+                created_at=url.created_at
+            ),
+            status_code=status.HTTP_201_CREATED
         )
         
-    except InvalidURLException as e:
-        logger.warning(f"Invalid URL: {e.message}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=e.message
-        )
-    except URLTooLongException as e:
-        logger.warning(f"URL too long: {e.message}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=e.message
-        )
-    except ShortCodeGenerationException as e:
-        logger.error(f"Failed to generate short code: {e.message}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Unable to generate unique short code. Please try again."
-        )
+    except URLShortenerException as e:
+        raise _to_http_exception(e)
     except Exception as e:
-        logger.error(f"Unexpected error shortening URL: {e}")
+        _error("Unexpected error shortening URL: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred"
+            detail=_SERVER_ERROR_DETAIL
         )
 
 
@@ -115,8 +176,8 @@ async def shorten_url(
 )
 async def get_url_statistics(
     short_code: str,
-    url_service: URLService = Depends(get_url_service)
-) -> URLStatsResponse:
+    db: AsyncSession = Depends(get_database_session)
+) -> Response:
     """
     Get URL statistics.
     
@@ -127,35 +188,27 @@ async def get_url_statistics(
     
     Args:
         short_code: The short code to get statistics for
-        url_service: URL service instance
+        db: Database session
         
     Returns:
-        URLStatsResponse: URL statistics
+        Response: URLStatsResponse JSON with URL statistics
         
     Raises:
         HTTPException: 404 if short code not found
     """
     try:
-        url = await url_service.get_url_stats(short_code)
+        stats = await _url_service(db).get_url_stats(short_code)
         
-        return URLStatsResponse(
-            short_code=url.short_code,
-            original_url=url.original_url,
-            click_count=url.click_count,
-            created_at=url.created_at,
-            last_accessed_at=url.last_accessed_at
-        )
+        # Values come from the database (or its cached copy), so skip
+        # re-validation
+        return _json_response(URLStatsResponse.model_construct(**stats))
         
-    except URLNotFoundException as e:
-        logger.warning(f"URL not found: {e.message}")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=e.message
-        )
+    except URLShortenerException as e:
+        raise _to_http_exception(e)
     except Exception as e:
-        logger.error(f"Unexpected error getting URL stats: {e}")
+        _error("Unexpected error getting URL stats: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred"
+            detail=_SERVER_ERROR_DETAIL
         )
 
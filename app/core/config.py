@@ -5,8 +5,9 @@ This module handles all configuration management using Pydantic Settings,
 supporting environment-based configuration for development, staging, and production.
 """
 
+from functools import cached_property
 from typing import Literal
-from pydantic import Field, PostgresDsn, RedisDsn, field_validator
+from pydantic import Field, PostgresDsn, RedisDsn, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -26,15 +27,31 @@ class Settings(BaseSettings):
         DATABASE_URL: PostgreSQL connection string
         DB_POOL_SIZE: Database connection pool size
         DB_MAX_OVERFLOW: Maximum overflow connections
+        DB_STATEMENT_CACHE_SIZE: Prepared statements cached per connection
+        DB_USE_PGBOUNCER: Delegate pooling to an external PgBouncer (transaction mode)
         
         REDIS_URL: Redis connection string
         REDIS_CACHE_TTL: Cache time-to-live in seconds (default: 24 hours)
+        NEGATIVE_CACHE_TTL: Seconds an unknown short code is cached as not found
+        STATS_CACHE_TTL: Seconds URL statistics are cached in Redis
+        LOCAL_CACHE_SIZE: Entries in each worker's in-process URL cache
+        LOCAL_CACHE_TTL: Seconds a URL stays in the in-process cache
+        REDIS_SOCKET_TIMEOUT: Seconds to wait for a Redis reply
+        REDIS_POOL_TIMEOUT: Seconds to wait for a free pooled Redis connection
+        CLICK_FLUSH_INTERVAL: Seconds between flushes of buffered click counts
+        CLICK_COUNTER_SHARDS: Redis keys per click counter (one per worker slot)
         
         RATE_LIMIT_PER_MINUTE: Rate limit per minute per IP
         REQUEST_TIMEOUT: Request timeout in seconds
+        HEALTH_CHECK_CACHE_TTL: Seconds a healthy health check result is reused
         
         LOG_LEVEL: Logging level
         CORS_ORIGINS: Allowed CORS origins (comma-separated)
+        
+        SHORT_CODE_STRATEGY: "random" (default) or "sequence" (Base62 of a Redis counter)
+        SHORT_CODE_POOL_SIZE: Pre-checked random codes kept in Redis (0 disables)
+        SHORTEN_BATCH_WINDOW_MS: Window for batching /shorten inserts (0 disables)
+        SHORTEN_BATCH_MAX_SIZE: Maximum URLs per batched INSERT
     """
     
     model_config = SettingsConfigDict(
@@ -64,6 +81,14 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = Field(default=20, description="Database connection pool size")
     DB_MAX_OVERFLOW: int = Field(default=10, description="Maximum overflow connections")
     DB_ECHO: bool = Field(default=False, description="Echo SQL statements")
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        default=512,
+        description="Prepared statements cached per database connection"
+    )
+    DB_USE_PGBOUNCER: bool = Field(
+        default=False,
+        description="Use NullPool and rely on an external PgBouncer for connection pooling"
+    )
     
     # Redis Settings
     REDIS_URL: RedisDsn = Field(
@@ -71,11 +96,50 @@ class Settings(BaseSettings):
         description="Redis connection string"
     )
     REDIS_CACHE_TTL: int = Field(default=86400, description="Cache TTL in seconds (24 hours)")
-    REDIS_MAX_CONNECTIONS: int = Field(default=50, description="Maximum Redis connections")
+    LOCAL_CACHE_SIZE: int = Field(
+        default=10_000,
+        description="Short codes each worker keeps in its in-process URL cache"
+    )
+    LOCAL_CACHE_TTL: int = Field(
+        default=60,
+        description="Seconds a URL stays in the in-process cache"
+    )
+    NEGATIVE_CACHE_TTL: int = Field(
+        default=60,
+        description="Seconds an unknown short code is cached as not found"
+    )
+    STATS_CACHE_TTL: int = Field(
+        default=300,
+        description="Seconds URL statistics are cached in Redis (dropped on click flush)"
+    )
+    REDIS_MAX_CONNECTIONS: int = Field(
+        default=50,
+        description="Maximum Redis connections per worker, shared by both connection pools"
+    )
+    REDIS_SOCKET_TIMEOUT: float = Field(
+        default=2.0,
+        description="Seconds to wait for a Redis reply before failing the command"
+    )
+    REDIS_POOL_TIMEOUT: float = Field(
+        default=5.0,
+        description="Seconds to wait for a free Redis connection when the pool is exhausted"
+    )
+    CLICK_FLUSH_INTERVAL: int = Field(
+        default=10,
+        description="Seconds between flushes of buffered click counts to the database"
+    )
+    CLICK_COUNTER_SHARDS: int = Field(
+        default=16,
+        description="Redis keys each short code's click counter is spread across"
+    )
     
     # Security & Performance
     RATE_LIMIT_PER_MINUTE: int = Field(default=100, description="Rate limit per IP per minute")
     REQUEST_TIMEOUT: int = Field(default=30, description="Request timeout in seconds")
+    HEALTH_CHECK_CACHE_TTL: float = Field(
+        default=2.0,
+        description="Seconds a healthy health check result is reused"
+    )
     
     # Logging
     LOG_LEVEL: str = Field(default="INFO", description="Logging level")
@@ -88,14 +152,28 @@ class Settings(BaseSettings):
     
     # URL Shortener Specific
     SHORT_CODE_LENGTH: int = Field(default=5, description="Length of short codes")
+    SHORT_CODE_STRATEGY: Literal["sequence", "random"] = Field(
+        default="random",
+        description="Derive short codes from a Redis counter or pick them at random"
+    )
+    SHORT_CODE_POOL_SIZE: int = Field(
+        default=10_000,
+        description="Random short codes pre-checked against the database and kept in Redis "
+                    "(random strategy only, 0 disables)"
+    )
     MAX_URL_LENGTH: int = Field(default=2048, description="Maximum URL length")
     MAX_COLLISION_RETRIES: int = Field(default=3, description="Max retries for collision detection")
+    SHORTEN_BATCH_WINDOW_MS: float = Field(
+        default=5.0,
+        description="Milliseconds to collect /shorten inserts into one batch (0 disables batching)"
+    )
+    SHORTEN_BATCH_MAX_SIZE: int = Field(default=500, description="Maximum URLs per batched INSERT")
     
-    @field_validator("CORS_ORIGINS")
-    @classmethod
-    def parse_cors_origins(cls, v: str) -> list[str]:
-        """Parse comma-separated CORS origins into a list."""
-        return [origin.strip() for origin in v.split(",") if origin.strip()]
+    @computed_field
+    @cached_property
+    def cors_origins(self) -> list[str]:
+        """Parse comma-separated CORS origins once into a list."""
+        return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
     
     @property
     def is_production(self) -> bool:
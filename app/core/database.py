@@ -5,7 +5,11 @@ This module provides SQLAlchemy async engine setup, session management,
 and database connection handling with proper connection pooling.
 """
 
-from typing import AsyncGenerator
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Sequence
+from sqlalchemy.sql import Executable
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -17,6 +21,7 @@ from sqlalchemy.pool import NullPool, QueuePool
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
 
 # Base class for SQLAlchemy models
 Base = declarative_base()
@@ -52,14 +57,43 @@ class DatabaseManager:
             "echo": settings.DB_ECHO,
             "pool_size": settings.DB_POOL_SIZE,
             "max_overflow": settings.DB_MAX_OVERFLOW,
-            "pool_pre_ping": True,  # Verify connections before using
-            "pool_recycle": 3600,   # Recycle connections after 1 hour
+            # No pre-ping round trip per checkout: stale connections are
+            # recycled, detected by TCP keepalives, and retried once at the
+            # query site (see URLRepository._execute)
+            "pool_pre_ping": False,
+            "pool_recycle": 1800,   # Recycle connections after 30 minutes
+            # Per-connection prepared statement caches (asyncpg driver and
+            # SQLAlchemy adapter) so hot queries skip PARSE after first use
+            "connect_args": {
+                "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                "server_settings": {
+                    "application_name": settings.APP_NAME,
+                    "tcp_keepalives_idle": "30",
+                    "tcp_keepalives_interval": "10",
+                },
+            },
         }
         
         # Use NullPool for test environment
         if settings.ENVIRONMENT == "test":
             engine_kwargs["poolclass"] = NullPool
         
+        # Behind PgBouncer (transaction mode) pooling happens out of process:
+        # each checkout opens a cheap connection to PgBouncer, and asyncpg's
+        # prepared statement caches (driver and SQLAlchemy adapter) must be
+        # disabled because consecutive transactions may land on different
+        # server backends.
+        if settings.DB_USE_PGBOUNCER:
+            engine_kwargs = {
+                "echo": settings.DB_ECHO,
+                "poolclass": NullPool,
+                "connect_args": {
+                    "statement_cache_size": 0,
+                    "prepared_statement_cache_size": 0,
+                },
+            }
+        
         self._engine = create_async_engine(
             database_url,
             **engine_kwargs
@@ -74,6 +108,34 @@ class DatabaseManager:
             autoflush=False,
         )
     
+    async def warmup(self, statements: Sequence[Executable]) -> None:
+        """
+        Open pooled connections ahead of traffic and prepare hot statements.
+        
+        Checks out DB_POOL_SIZE connections concurrently and executes each
+        statement once on every connection, so the first real requests find
+        open connections with the statements already prepared. Skipped when
+        pooling is delegated to PgBouncer. Failures are logged, not raised.
+        
+        Args:
+            statements: Read-only statements to prepare on each connection
+        """
+        if settings.DB_USE_PGBOUNCER:
+            return
+        
+        async def prepare_connection() -> None:
+            async with self.engine.connect() as conn:
+                for statement in statements:
+                    await conn.execute(statement)
+        
+        try:
+            await asyncio.gather(
+                *(prepare_connection() for _ in range(settings.DB_POOL_SIZE))
+            )
+            logger.info("Warmed up %s database connections", settings.DB_POOL_SIZE)
+        except Exception as e:
+            logger.warning("Database warmup failed: %s", e)
+    
     async def close(self) -> None:
         """Close database engine and cleanup connections."""
         if self._engine:
@@ -81,15 +143,27 @@ class DatabaseManager:
             self._engine = None
             self._session_factory = None
     
-    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncIterator[AsyncSession]:
         """
-        Get database session.
+        Open a database session as a context manager.
+        
+        The session is one unit of work: statements run in a single
+        transaction that is committed once when the block exits (or rolled
+        back if it raises). Repository methods flush but do not commit,
+        so a request costs at most one COMMIT. The exception is
+        URLRepository.add_click_counts, which commits its own batch so a
+        failed flush can be returned to the Redis buffer.
+        
+        Background tasks use this directly: leaving the block, by raising
+        too, ends the session at once, whereas breaking out of an async for
+        over get_session() leaves it open until the generator is finalized.
         
         Yields:
             AsyncSession: Database session for executing queries
             
         Example:
-            async with database_manager.get_session() as session:
+            async with database_manager.session_scope() as session:
                 result = await session.execute(query)
         """
         if not self._session_factory:
@@ -102,8 +176,18 @@ class DatabaseManager:
             except Exception:
                 await session.rollback()
                 raise
-            finally:
-                await session.close()
+    
+    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Get database session, for use as a FastAPI dependency.
+        
+        See session_scope() for the transaction semantics.
+        
+        Yields:
+            AsyncSession: Database session for executing queries
+        """
+        async with self.session_scope() as session:
+            yield session
     
     @property
     def engine(self) -> AsyncEngine:
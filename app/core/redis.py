@@ -6,16 +6,59 @@ health checks, and helper methods for caching operations.
 """
 
 import logging
+import socket
 from typing import Any
-import json
+import orjson
 from redis import asyncio as aioredis
-from redis.asyncio import Redis, ConnectionPool
-from redis.exceptions import RedisError, ConnectionError as RedisConnectionError
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.commands.core import AsyncScript
+from redis.exceptions import (
+    RedisError,
+    ConnectionError as RedisConnectionError,
+    TimeoutError as RedisTimeoutError,
+)
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# TCP keepalive probing for pooled sockets: first probe after 30s idle, then
+# every 10s, dropping the connection after 3 missed probes. Options missing
+# on the platform (e.g. TCP_KEEPIDLE on macOS) are skipped.
+_KEEPALIVE_OPTIONS = {
+    getattr(socket, name): value
+    for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+    if hasattr(socket, name)
+}
+
+# Redirect lookup: return the cached URL and, on a hit, refresh its TTL and
+# increment the click counter atomically. A not-found marker is returned
+# as-is, without touching its TTL or counting a click.
+# KEYS: url key, click counter key
+# ARGV: ttl seconds, not-found marker
+_REDIRECT_SCRIPT = """
+local url = redis.call('GET', KEYS[1])
+if url and url ~= ARGV[2] then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+    redis.call('INCR', KEYS[2])
+end
+return url
+"""
+
+# Write a value only while a guard key still holds the value read earlier,
+# so a write based on data read before a concurrent change is dropped
+# KEYS: value key, guard key
+# ARGV: value, ttl seconds, expected guard value ('' for a missing key)
+_SET_IF_UNCHANGED_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') == ARGV[3] then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
 
 class RedisManager:
     """
@@ -27,44 +70,91 @@ class RedisManager:
     
     def __init__(self) -> None:
         """Initialize Redis manager."""
-        self._pool: ConnectionPool | None = None
+        self._pool: BlockingConnectionPool | None = None
         self._client: Redis | None = None
+        self._binary_pool: BlockingConnectionPool | None = None
+        self._binary_client: Redis | None = None
+        self._redirect_script: AsyncScript | None = None
+        self._set_if_unchanged_script: AsyncScript | None = None
     
     def init(self) -> None:
         """
         Initialize Redis connection pool and client.
         
         Creates a connection pool with configuration from settings
-        and establishes a Redis client connection.
+        and establishes a Redis client connection. A second pool without
+        response decoding serves binary payloads (set_json/get_json), so
+        their replies reach the decoder as bytes instead of being decoded
+        to str first. The two pools share the REDIS_MAX_CONNECTIONS budget;
+        the binary pool only serves URL statistics and gets a quarter of it.
         """
-        redis_url = str(settings.REDIS_URL)
+        total = settings.REDIS_MAX_CONNECTIONS
+        binary_connections = max(1, total // 4)
         
-        # Create connection pool
-        self._pool = ConnectionPool.from_url(
-            redis_url,
-            max_connections=settings.REDIS_MAX_CONNECTIONS,
+        self._pool = self._create_pool(
             decode_responses=True,
+            max_connections=max(1, total - binary_connections)
+        )
+        self._client = Redis(connection_pool=self._pool)
+        
+        self._binary_pool = self._create_pool(
+            decode_responses=False,
+            max_connections=binary_connections
+        )
+        self._binary_client = Redis(connection_pool=self._binary_pool)
+        
+        logger.info("Redis connection initialized successfully")
+    
+    @staticmethod
+    def _create_pool(decode_responses: bool, max_connections: int) -> BlockingConnectionPool:
+        """
+        Create a connection pool with configuration from settings.
+        
+        Args:
+            decode_responses: Whether replies are decoded to str
+            max_connections: Maximum connections this pool may open
+        
+        Returns:
+            BlockingConnectionPool: New connection pool
+        """
+        # Bounded connection pool: once max_connections are in use,
+        # callers wait up to REDIS_POOL_TIMEOUT seconds for a free one
+        # instead of opening more connections
+        return BlockingConnectionPool.from_url(
+            str(settings.REDIS_URL),
+            max_connections=max_connections,
+            timeout=settings.REDIS_POOL_TIMEOUT,
+            decode_responses=decode_responses,
             encoding="utf-8",
             socket_connect_timeout=5,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
             socket_keepalive=True,
+            socket_keepalive_options=_KEEPALIVE_OPTIONS,
             health_check_interval=30,
+            # Reconnect with short exponential backoff (~0.35s worst case);
+            # the database remains the fallback when Redis stays unreachable
+            retry=Retry(ExponentialBackoff(cap=1, base=0.05), retries=3),
+            retry_on_error=[RedisConnectionError, RedisTimeoutError],
         )
-        
-        # Create Redis client
-        self._client = Redis(connection_pool=self._pool)
-        
-        logger.info("Redis connection initialized successfully")
     
     async def close(self) -> None:
         """Close Redis connections and cleanup resources."""
         if self._client:
-            await self._client.close()
+            await self._client.aclose(close_connection_pool=False)
             self._client = None
         
         if self._pool:
-            await self._pool.disconnect()
+            await self._pool.aclose()
             self._pool = None
         
+        if self._binary_client:
+            await self._binary_client.aclose(close_connection_pool=False)
+            self._binary_client = None
+        
+        if self._binary_pool:
+            await self._binary_pool.aclose()
+            self._binary_pool = None
+        
         logger.info("Redis connections closed")
     
     async def ping(self) -> bool:
@@ -79,7 +169,7 @@ class RedisManager:
                 return False
             return await self._client.ping()
         except (RedisError, RedisConnectionError) as e:
-            logger.error(f"Redis health check failed: {e}")
+            logger.error("Redis health check failed: %s", e)
             return False
     
     async def get(self, key: str) -> str | None:
@@ -97,14 +187,15 @@ class RedisManager:
                 raise RuntimeError("RedisManager not initialized. Call init() first.")
             return await self._client.get(key)
         except RedisError as e:
-            logger.error(f"Redis GET error for key '{key}': {e}")
+            logger.error("Redis GET error for key '%s': %s", key, e)
             return None
     
     async def set(
         self,
         key: str,
-        value: str,
-        ttl: int | None = None
+        value: str | bytes,
+        ttl: int | None = None,
+        nx: bool = False
     ) -> bool:
         """
         Set value in Redis with optional TTL.
@@ -113,20 +204,43 @@ class RedisManager:
             key: Cache key
             value: Value to cache
             ttl: Time-to-live in seconds (defaults to settings.REDIS_CACHE_TTL)
+            nx: Only set the key if it does not exist yet
             
         Returns:
-            bool: True if successful, False otherwise
+            bool: True if the value was stored, False otherwise
         """
         try:
             if not self._client:
                 raise RuntimeError("RedisManager not initialized. Call init() first.")
             
             ttl = ttl or settings.REDIS_CACHE_TTL
-            return await self._client.setex(key, ttl, value)
+            return bool(await self._client.set(key, value, ex=ttl, nx=nx))
         except RedisError as e:
-            logger.error(f"Redis SET error for key '{key}': {e}")
+            logger.error("Redis SET error for key '%s': %s", key, e)
             return False
     
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        """
+        Get several values from Redis in one round trip.
+        
+        Args:
+            keys: Cache keys
+        
+        Returns:
+            list: One value (or None if not found) per key, in order; all
+            None on error
+        """
+        if not keys:
+            return []
+        
+        try:
+            if not self._client:
+                raise RuntimeError("RedisManager not initialized. Call init() first.")
+            return await self._client.mget(keys)
+        except RedisError as e:
+            logger.error("Redis MGET error (%s key(s)): %s", len(keys), e)
+            return [None] * len(keys)
+    
     async def delete(self, key: str) -> bool:
         """
         Delete key from Redis.
@@ -143,7 +257,7 @@ class RedisManager:
             result = await self._client.delete(key)
             return result > 0
         except RedisError as e:
-            logger.error(f"Redis DELETE error for key '{key}': {e}")
+            logger.error("Redis DELETE error for key '%s': %s", key, e)
             return False
     
     async def exists(self, key: str) -> bool:
@@ -162,7 +276,7 @@ class RedisManager:
             result = await self._client.exists(key)
             return result > 0
         except RedisError as e:
-            logger.error(f"Redis EXISTS error for key '{key}': {e}")
+            logger.error("Redis EXISTS error for key '%s': %s", key, e)
             return False
     
     async def increment(self, key: str, amount: int = 1) -> int | None:
@@ -181,13 +295,171 @@ class RedisManager:
                 raise RuntimeError("RedisManager not initialized. Call init() first.")
             return await self._client.incrby(key, amount)
         except RedisError as e:
-            logger.error(f"Redis INCREMENT error for key '{key}': {e}")
+            logger.error("Redis INCREMENT error for key '%s': %s", key, e)
+            return None
+    
+    async def getdel(self, key: str) -> str | None:
+        """
+        Atomically get a value and delete its key.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Value before deletion or None if not found or error
+        """
+        try:
+            if not self._client:
+                raise RuntimeError("RedisManager not initialized. Call init() first.")
+            return await self._client.getdel(key)
+        except RedisError as e:
+            logger.error("Redis GETDEL error for key '%s': %s", key, e)
+            return None
+    
+    async def lpop(self, key: str) -> str | None:
+        """
+        Atomically remove and return the first element of a list.
+        
+        Args:
+            key: List key
+        
+        Returns:
+            First element or None if the list is empty or on error
+        """
+        try:
+            if not self._client:
+                raise RuntimeError("RedisManager not initialized. Call init() first.")
+            return await self._client.lpop(key)
+        except RedisError as e:
+            logger.error("Redis LPOP error for key '%s': %s", key, e)
+            return None
+    
+    async def rpush(self, key: str, *values: str) -> int | None:
+        """
+        Append values to a list.
+        
+        Args:
+            key: List key
+            values: Values to append, in order
+        
+        Returns:
+            New list length or None on error
+        """
+        try:
+            if not self._client:
+                raise RuntimeError("RedisManager not initialized. Call init() first.")
+            return await self._client.rpush(key, *values)
+        except RedisError as e:
+            logger.error("Redis RPUSH error for key '%s': %s", key, e)
+            return None
+    
+    async def llen(self, key: str) -> int | None:
+        """
+        Get the length of a list.
+        
+        Args:
+            key: List key
+        
+        Returns:
+            List length (0 if missing) or None on error
+        """
+        try:
+            if not self._client:
+                raise RuntimeError("RedisManager not initialized. Call init() first.")
+            return await self._client.llen(key)
+        except RedisError as e:
+            logger.error("Redis LLEN error for key '%s': %s", key, e)
+            return None
+    
+    async def scan_keys(self, pattern: str, count: int = 1000) -> list[str]:
+        """
+        Collect keys matching a pattern using incremental SCAN.
+        
+        Args:
+            pattern: Glob-style key pattern
+            count: Hint for the number of keys returned per SCAN call
+        
+        Returns:
+            list[str]: Matching keys (empty on error)
+        """
+        try:
+            if not self._client:
+                raise RuntimeError("RedisManager not initialized. Call init() first.")
+            return [key async for key in self._client.scan_iter(match=pattern, count=count)]
+        except RedisError as e:
+            logger.error("Redis SCAN error for pattern '%s': %s", pattern, e)
+            return []
+    
+    async def pipeline_execute(self, ops: list[tuple[str, tuple[Any, ...]]]) -> list[Any] | None:
+        """
+        Run several commands in one round trip.
+        
+        Uses a non-transactional pipeline: commands are sent together and
+        their replies read together, without MULTI/EXEC.
+        
+        Args:
+            ops: (command name, positional arguments) pairs, e.g.
+                ("get", (key,)) or ("incr", (key,))
+        
+        Returns:
+            list: One reply per command, in order, or None on error
+        """
+        try:
+            if not self._client:
+                raise RuntimeError("RedisManager not initialized. Call init() first.")
+            async with self._client.pipeline(transaction=False) as pipe:
+                for command, args in ops:
+                    getattr(pipe, command)(*args)
+                return await pipe.execute()
+        except RedisError as e:
+            logger.error("Redis pipeline error (%s command(s)): %s", len(ops), e)
+            return None
+    
+    async def get_and_count(
+        self,
+        url_key: str,
+        counter_key: str,
+        miss_marker: str,
+        ttl: int | None = None
+    ) -> str | None:
+        """
+        Get a cached URL and record a click on it in one round trip.
+        
+        Runs a Lua script with EVALSHA (loaded on first use): on a hit the
+        URL's TTL is refreshed and the click counter is incremented; on a
+        miss, or when the key holds miss_marker, nothing is written. Both
+        keys must hash to the same slot if this is ever run on Redis Cluster.
+        
+        Args:
+            url_key: Cache key of the URL
+            counter_key: Click counter key
+            miss_marker: Value cached for short codes known not to exist
+            ttl: Time-to-live in seconds (defaults to settings.REDIS_CACHE_TTL)
+        
+        Returns:
+            Cached URL (or miss_marker) or None if not found or error
+        """
+        try:
+            if not self._client:
+                raise RuntimeError("RedisManager not initialized. Call init() first.")
+            if self._redirect_script is None:
+                self._redirect_script = self._client.register_script(_REDIRECT_SCRIPT)
+            
+            return await self._redirect_script(
+                keys=[url_key, counter_key],
+                args=[ttl or settings.REDIS_CACHE_TTL, miss_marker],
+                client=self._client,
+            )
+        except RedisError as e:
+            logger.error("Redis redirect script error for key '%s': %s", url_key, e)
             return None
     
     async def set_json(self, key: str, value: Any, ttl: int | None = None) -> bool:
         """
         Set JSON-serializable value in Redis.
         
+        The orjson bytes are written through the binary client.
+        
         Args:
             key: Cache key
             value: Value to serialize and cache
@@ -197,16 +469,72 @@ class RedisManager:
             bool: True if successful, False otherwise
         """
         try:
-            json_value = json.dumps(value)
-            return await self.set(key, json_value, ttl)
-        except (TypeError, ValueError) as e:
-            logger.error(f"JSON serialization error for key '{key}': {e}")
+            if not self._binary_client:
+                raise RuntimeError("RedisManager not initialized. Call init() first.")
+            ttl = ttl or settings.REDIS_CACHE_TTL
+            return bool(await self._binary_client.set(key, orjson.dumps(value), ex=ttl))
+        except orjson.JSONEncodeError as e:
+            logger.error("JSON serialization error for key '%s': %s", key, e)
+            return False
+        except RedisError as e:
+            logger.error("Redis SET error for key '%s': %s", key, e)
+            return False
+    
+    async def set_json_if_unchanged(
+        self,
+        key: str,
+        value: Any,
+        guard_key: str,
+        guard_value: str,
+        ttl: int | None = None
+    ) -> bool:
+        """
+        Set a JSON-serializable value only if guard_key still holds guard_value.
+        
+        The check and the write run atomically in a Lua script on the binary
+        client. Both keys must hash to the same slot if this is ever run on
+        Redis Cluster.
+        
+        Args:
+            key: Cache key
+            value: Value to serialize and cache
+            guard_key: Key whose value must be unchanged
+            guard_value: Value of guard_key read before value was computed
+                ("" if the key did not exist)
+            ttl: Time-to-live in seconds
+        
+        Returns:
+            bool: True if the value was written, False if the guard changed
+            or on error
+        """
+        try:
+            if not self._binary_client:
+                raise RuntimeError("RedisManager not initialized. Call init() first.")
+            if self._set_if_unchanged_script is None:
+                self._set_if_unchanged_script = self._binary_client.register_script(
+                    _SET_IF_UNCHANGED_SCRIPT
+                )
+            
+            written = await self._set_if_unchanged_script(
+                keys=[key, guard_key],
+                args=[orjson.dumps(value), ttl or settings.REDIS_CACHE_TTL, guard_value],
+                client=self._binary_client,
+            )
+            return bool(written)
+        except orjson.JSONEncodeError as e:
+            logger.error("JSON serialization error for key '%s': %s", key, e)
+            return False
+        except RedisError as e:
+            logger.error("Redis conditional SET error for key '%s': %s", key, e)
             return False
     
     async def get_json(self, key: str) -> Any | None:
         """
         Get and deserialize JSON value from Redis.
         
+        The value is read through the binary client and handed to orjson
+        as bytes.
+        
         Args:
             key: Cache key
             
@@ -214,12 +542,17 @@ class RedisManager:
             Deserialized value or None if not found or error
         """
         try:
-            value = await self.get(key)
+            if not self._binary_client:
+                raise RuntimeError("RedisManager not initialized. Call init() first.")
+            value = await self._binary_client.get(key)
             if value is None:
                 return None
-            return json.loads(value)
-        except (TypeError, ValueError, json.JSONDecodeError) as e:
-            logger.error(f"JSON deserialization error for key '{key}': {e}")
+            return orjson.loads(value)
+        except orjson.JSONDecodeError as e:
+            logger.error("JSON deserialization error for key '%s': %s", key, e)
+            return None
+        except RedisError as e:
+            logger.error("Redis GET error for key '%s': %s", key, e)
             return None
     
     @property
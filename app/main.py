@@ -8,13 +8,14 @@ necessary middleware, routers, and lifecycle event handlers.
 import logging
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
-from fastapi import FastAPI, Request, status
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi import Depends, FastAPI, Request, status
+from fastapi.responses import Response, RedirectResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import database_manager
@@ -23,14 +24,31 @@ from app.core.logging import setup_logging
 from app.core.exceptions import URLShortenerException
 from app.api.v1.router import api_router
 from app.services.url_service import URLService
+from app.repositories.url_repository import warmup_statements
+from app.services.click_flusher import click_count_flusher
+from app.services.url_batch_writer import url_batch_writer
+from app.services.code_pool import short_code_pool
 from app.core.dependencies import get_database_session
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# Rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Rate limiter with counters in Redis, so every worker enforces the same
+# per-IP limit; falls back to per-worker memory while Redis is unreachable.
+# slowapi only drives the synchronous limits storage, so each rate-limited
+# request makes one blocking Redis round trip on the event loop (bounded by
+# REDIS_SOCKET_TIMEOUT)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=str(settings.REDIS_URL),
+    storage_options={
+        "socket_connect_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+    },
+    key_prefix="ratelimit",
+    in_memory_fallback_enabled=True,
+)
 
 
 @asynccontextmanager
@@ -42,11 +60,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     database and Redis connections.
     """
     # Startup
-    logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
+    logger.info("Starting %s v%s", settings.APP_NAME, settings.APP_VERSION)
+    logger.info("Environment: %s", settings.ENVIRONMENT)
     
     # Initialize database
     database_manager.init()
+    await database_manager.warmup(warmup_statements())
     logger.info("Database initialized")
     
     # Initialize Redis
@@ -59,10 +78,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     else:
         logger.warning("Redis connection failed")
     
+    # Start flushing buffered click counts
+    click_count_flusher.start()
+    
+    # Start batching /shorten inserts
+    if settings.SHORTEN_BATCH_WINDOW_MS > 0:
+        url_batch_writer.start()
+    
+    # Keep pre-checked random short codes ready
+    if settings.SHORT_CODE_STRATEGY == "random" and settings.SHORT_CODE_POOL_SIZE > 0:
+        short_code_pool.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down application")
+    await short_code_pool.stop()
+    await url_batch_writer.stop()
+    await click_count_flusher.stop()
     await database_manager.close()
     await redis_manager.close()
     logger.info("Cleanup complete")
@@ -76,6 +109,7 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -86,7 +120,7 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -98,9 +132,9 @@ app.add_middleware(
 async def url_shortener_exception_handler(
     request: Request,
     exc: URLShortenerException
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Handle custom URL shortener exceptions."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.message,
@@ -113,9 +147,9 @@ async def url_shortener_exception_handler(
 async def validation_exception_handler(
     request: Request,
     exc: RequestValidationError
-) -> JSONResponse:
+) -> ORJSONResponse:
     """Handle request validation errors."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error": "Validation error",
@@ -146,8 +180,9 @@ async def root() -> dict:
 @limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
 async def redirect_to_url(
     short_code: str,
-    request: Request
-) -> RedirectResponse:
+    request: Request,
+    db: AsyncSession = Depends(get_database_session)
+) -> Response:
     """
     Redirect short code to original URL.
     
@@ -157,32 +192,40 @@ async def redirect_to_url(
     Args:
         short_code: The short code from the URL path
         request: FastAPI request object
+        db: Database session
         
     Returns:
-        RedirectResponse: 307 redirect to original URL
+        Response: 307 redirect to original URL
         
     Raises:
         HTTPException: 404 if short code not found
     """
     try:
-        # Get database session
-        async for db in get_database_session():
-            # Create URL service
-            url_service = URLService(db_session=db, redis_manager=redis_manager)
-            
-            # Get original URL
-            original_url = await url_service.get_original_url(short_code)
-            
-            logger.info(f"Redirecting {short_code} -> {original_url}")
-            
-            # 307 Temporary Redirect (preserves HTTP method)
-            return RedirectResponse(
-                url=original_url,
-                status_code=status.HTTP_307_TEMPORARY_REDIRECT
+        # Create URL service
+        url_service = URLService(db_session=db, redis_manager=redis_manager)
+        
+        # Get original URL
+        original_url = await url_service.get_original_url(short_code)
+        
+        logger.info("Redirecting %s -> %s", short_code, original_url)
+        
+        # 307 Temporary Redirect (preserves HTTP method). Kept temporary
+        # on purpose: a permanent redirect would be cached by clients and
+        # stop further clicks from being counted.
+        if original_url.isascii():
+            # Stored URLs are already normalized and percent-encoded, so
+            # skip RedirectResponse's per-request re-quoting
+            return Response(
+                status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+                headers={"location": original_url}
             )
+        return RedirectResponse(
+            url=original_url,
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT
+        )
     except Exception as e:
-        logger.error(f"Error redirecting: {e}")
-        return JSONResponse(
+        logger.error("Error redirecting: %s", e)
+        return ORJSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
             content={"error": f"Short code '{short_code}' not found"}
         )
@@ -194,6 +237,8 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.HOST,
         port=settings.PORT,
+        loop="uvloop",
+        http="httptools",
         reload=settings.DEBUG,
         log_level=settings.LOG_LEVEL.lower()
     )
@@ -47,16 +47,15 @@ class URL(Base):
         Text,
         nullable=False,
         unique=True,
-        index=True,
         comment="The full original URL"
     )
     
-    # Short code (5 characters, unique)
+    # Short code (5 characters, unique via idx_short_code below). Compared
+    # byte-wise in PostgreSQL: Base62 codes are case-sensitive ASCII, so
+    # locale-aware collation would only slow down index lookups.
     short_code: Mapped[str] = mapped_column(
-        String(5),
+        String(5).with_variant(String(5, collation="C"), "postgresql"),
         nullable=False,
-        unique=True,
-        index=True,
         comment="The 5-character short code"
     )
     
@@ -86,7 +85,13 @@ class URL(Base):
     
     # Additional indexes for performance
     __table_args__ = (
-        Index("idx_short_code_created", "short_code", "created_at"),
+        # Covering index: redirects are served by an index-only scan
+        Index(
+            "idx_short_code",
+            "short_code",
+            unique=True,
+            postgresql_include=["original_url"],
+        ),
         Index("idx_created_clicks", "created_at", "click_count"),
     )
     
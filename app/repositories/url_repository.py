@@ -5,18 +5,69 @@ This module provides the Data Access Layer (DAL) for URL operations,
 handling all database interactions related to URL mappings.
 """
 
-from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 import logging
-from sqlalchemy import select, update
+from sqlalchemy import Insert, Row, bindparam, exists, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.sql import Executable
+from sqlalchemy.engine import Result
+from sqlalchemy.exc import DBAPIError, IntegrityError, SQLAlchemyError
 
 from app.models.url import URL
 from app.core.exceptions import DatabaseException
 
 logger = logging.getLogger(__name__)
 
+# INSERT constructs supporting ON CONFLICT, by dialect (SQLite is used in tests)
+_UPSERT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+# Read statements are built once; values are bound per call
+_SELECT_BY_SHORT_CODE = select(URL).where(URL.short_code == bindparam("short_code"))
+_SELECT_BY_ORIGINAL_URL = select(URL).where(URL.original_url == bindparam("original_url"))
+_SELECT_ORIGINAL_URL = (
+    select(URL.original_url).where(URL.short_code == bindparam("short_code"))
+)
+_SELECT_ORIGINAL_URLS = select(URL.short_code, URL.original_url).where(
+    URL.short_code.in_(bindparam("short_codes", expanding=True))
+)
+_SELECT_EXISTING_SHORT_CODES = select(URL.short_code).where(
+    URL.short_code.in_(bindparam("short_codes", expanding=True))
+)
+_SELECT_SHORT_CODE_EXISTS = select(
+    exists().where(URL.short_code == bindparam("short_code"))
+)
+_SELECT_MAX_ID = select(func.max(URL.id))
+_SELECT_STATS = select(
+    URL.short_code,
+    URL.original_url,
+    URL.click_count,
+    URL.created_at,
+    URL.last_accessed_at,
+).where(URL.short_code == bindparam("short_code"))
+
+
+def warmup_statements() -> list[Executable]:
+    """
+    Get the hot read statements to prepare on pooled connections at startup.
+    
+    These are the repository's own statements with placeholder values, so
+    the prepared statement cache is keyed on the same SQL text.
+    
+    Returns:
+        list[Executable]: Read-only lookup statements
+    """
+    return [
+        _SELECT_ORIGINAL_URL.params(short_code=""),
+        _SELECT_BY_SHORT_CODE.params(short_code=""),
+        _SELECT_BY_ORIGINAL_URL.params(original_url=""),
+    ]
+
 
 class URLRepository:
     """
@@ -35,6 +86,35 @@ class URLRepository:
         """
         self.session = session
     
+    async def _execute(
+        self,
+        stmt: Executable,
+        params: dict[str, Any] | None = None
+    ) -> Result[Any]:
+        """
+        Execute a read statement, retrying once on a dropped connection.
+        
+        Connections are not pre-pinged on checkout, so a connection closed
+        by the server is only noticed when a query fails on it. SQLAlchemy
+        then invalidates it; the session is rolled back and the statement
+        is re-run on a fresh connection.
+        
+        Args:
+            stmt: Read-only statement to execute
+            params: Values for the statement's bind parameters
+        
+        Returns:
+            Result: Statement result
+        """
+        try:
+            return await self.session.execute(stmt, params)
+        except DBAPIError as e:
+            if not e.connection_invalidated:
+                raise
+            logger.warning("Database connection was invalidated, retrying query once")
+            await self.session.rollback()
+            return await self.session.execute(stmt, params)
+    
     async def create_url(
         self,
         original_url: str,
@@ -54,33 +134,140 @@ class URLRepository:
             DatabaseException: If creation fails or short code already exists
         """
         try:
-            url = URL(
-                original_url=original_url,
-                short_code=short_code,
-                click_count=0
+            # One INSERT ... RETURNING instead of a unit-of-work flush
+            stmt = (
+                insert(URL)
+                .values(original_url=original_url, short_code=short_code, click_count=0)
+                .returning(URL)
             )
-            self.session.add(url)
-            await self.session.flush()
-            await self.session.refresh(url)
+            url = (await self.session.scalars(stmt)).one()
             
             logger.info(
-                f"Created URL mapping: short_code='{short_code}', "
-                f"original_url='{original_url}'"
+                "Created URL mapping: short_code='%s', "
+                "original_url='%s'",
+                short_code,
+                original_url
             )
             return url
             
         except IntegrityError as e:
             await self.session.rollback()
-            logger.error(f"Integrity error creating URL: {e}")
+            logger.error("Integrity error creating URL: %s", e)
             raise DatabaseException(
                 operation="create_url",
                 details=f"Short code '{short_code}' or URL already exists"
             )
         except SQLAlchemyError as e:
             await self.session.rollback()
-            logger.error(f"Database error creating URL: {e}")
+            logger.error("Database error creating URL: %s", e)
             raise DatabaseException(operation="create_url", details=str(e))
     
+    def _upsert(self) -> Insert:
+        """
+        Build an INSERT that returns the stored row when the URL exists.
+        
+        ON CONFLICT (original_url) DO UPDATE with a no-op assignment makes
+        RETURNING yield the existing row instead of raising, so the lookup
+        and the insert happen in one statement without a race.
+        
+        Returns:
+            Insert: Dialect-specific upsert returning the URL entity
+        """
+        dialect_insert = _UPSERT_INSERTS[self.session.get_bind().dialect.name]
+        stmt = dialect_insert(URL)
+        return stmt.on_conflict_do_update(
+            index_elements=[URL.original_url],
+            set_={"original_url": stmt.excluded.original_url},
+        )
+    
+    async def upsert_url(self, original_url: str, short_code: str) -> Optional[URL]:
+        """
+        Create a URL mapping, or return the existing one for the same URL.
+        
+        Args:
+            original_url: The original URL to be shortened
+            short_code: The short code to use if the URL is new
+        
+        Returns:
+            URL: Created or existing URL model instance, or None if the short
+            code is already taken by another URL
+        
+        Raises:
+            DatabaseException: If the statement fails
+        """
+        try:
+            stmt = (
+                self._upsert()
+                .values(original_url=original_url, short_code=short_code, click_count=0)
+                .returning(URL)
+            )
+            result = await self.session.scalars(
+                stmt, execution_options={"populate_existing": True}
+            )
+            url = result.one()
+            
+            logger.info(
+                "Stored URL mapping: short_code='%s', "
+                "original_url='%s'",
+                url.short_code,
+                original_url
+            )
+            return url
+        
+        except IntegrityError as e:
+            # original_url conflicts are absorbed, so this is a short code collision
+            await self.session.rollback()
+            logger.warning("Short code '%s' already taken: %s", short_code, e)
+            return None
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error("Database error upserting URL: %s", e)
+            raise DatabaseException(operation="upsert_url", details=str(e))
+    
+    async def create_urls(self, pairs: list[tuple[str, str]]) -> list[URL]:
+        """
+        Create several URL mappings with one multi-row upsert.
+        
+        URLs that are already stored return their existing row. Each
+        original URL may appear only once per call. The statement is
+        all-or-nothing: if any short code is taken, no row is created.
+        
+        Args:
+            pairs: (original_url, short_code) tuples with distinct URLs
+        
+        Returns:
+            list[URL]: Created or existing URL model instances, in input order
+        
+        Raises:
+            DatabaseException: If creation fails or any short code exists
+        """
+        try:
+            stmt = self._upsert().returning(URL, sort_by_parameter_order=True)
+            result = await self.session.scalars(
+                stmt,
+                [
+                    {"original_url": original_url, "short_code": short_code, "click_count": 0}
+                    for original_url, short_code in pairs
+                ],
+                execution_options={"populate_existing": True}
+            )
+            urls = list(result.all())
+            
+            logger.info("Stored %s URL mappings in one batch", len(urls))
+            return urls
+        
+        except IntegrityError as e:
+            await self.session.rollback()
+            logger.warning("Integrity error creating URL batch: %s", e)
+            raise DatabaseException(
+                operation="create_urls",
+                details="A short code in the batch already exists"
+            )
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error("Database error creating URL batch: %s", e)
+            raise DatabaseException(operation="create_urls", details=str(e))
+    
     async def get_by_short_code(self, short_code: str) -> Optional[URL]:
         """
         Retrieve URL by short code.
@@ -95,21 +282,69 @@ class URLRepository:
             DatabaseException: If database query fails
         """
         try:
-            stmt = select(URL).where(URL.short_code == short_code)
-            result = await self.session.execute(stmt)
+            result = await self._execute(_SELECT_BY_SHORT_CODE, {"short_code": short_code})
             url = result.scalar_one_or_none()
             
             if url:
-                logger.debug(f"Found URL for short_code='{short_code}'")
+                logger.debug("Found URL for short_code='%s'", short_code)
             else:
-                logger.debug(f"No URL found for short_code='{short_code}'")
+                logger.debug("No URL found for short_code='%s'", short_code)
             
             return url
             
         except SQLAlchemyError as e:
-            logger.error(f"Database error getting URL by short code: {e}")
+            logger.error("Database error getting URL by short code: %s", e)
             raise DatabaseException(operation="get_by_short_code", details=str(e))
     
+    async def get_original_url(self, short_code: str) -> Optional[str]:
+        """
+        Retrieve only the original URL for a short code.
+        
+        Selects a single column instead of the full entity, so no ORM
+        instance is materialized or tracked in the identity map. Used by
+        the redirect path where only the target URL is needed.
+        
+        Args:
+            short_code: The short code to look up
+            
+        Returns:
+            Original URL if found, None otherwise
+            
+        Raises:
+            DatabaseException: If database query fails
+        """
+        try:
+            result = await self._execute(_SELECT_ORIGINAL_URL, {"short_code": short_code})
+            return result.scalar_one_or_none()
+            
+        except SQLAlchemyError as e:
+            logger.error("Database error getting original URL: %s", e)
+            raise DatabaseException(operation="get_original_url", details=str(e))
+    
+    async def get_original_urls(self, short_codes: list[str]) -> dict[str, str]:
+        """
+        Retrieve the original URLs for several short codes in one query.
+        
+        Args:
+            short_codes: The short codes to look up
+        
+        Returns:
+            dict[str, str]: Original URL by short code, for codes that exist
+        
+        Raises:
+            DatabaseException: If database query fails
+        """
+        if not short_codes:
+            return {}
+        
+        try:
+            result = await self._execute(_SELECT_ORIGINAL_URLS, {"short_codes": short_codes})
+            return {short_code: original_url for short_code, original_url in result}
+        
+        except SQLAlchemyError as e:
+            logger.error("Database error getting original URLs: %s", e)
+            raise DatabaseException(operation="get_original_urls", details=str(e))
+    
     async def get_by_original_url(self, original_url: str) -> Optional[URL]:
         """
         Retrieve URL by original URL.
@@ -126,17 +361,18 @@ class URLRepository:
             DatabaseException: If database query fails
         """
         try:
-            stmt = select(URL).where(URL.original_url == original_url)
-            result = await self.session.execute(stmt)
+            result = await self._execute(
+                _SELECT_BY_ORIGINAL_URL, {"original_url": original_url}
+            )
             url = result.scalar_one_or_none()
             
             if url:
-                logger.debug(f"Found existing URL mapping for '{original_url}'")
+                logger.debug("Found existing URL mapping for '%s'", original_url)
             
             return url
             
         except SQLAlchemyError as e:
-            logger.error(f"Database error getting URL by original URL: {e}")
+            logger.error("Database error getting URL by original URL: %s", e)
             raise DatabaseException(operation="get_by_original_url", details=str(e))
     
     async def check_short_code_exists(self, short_code: str) -> bool:
@@ -153,82 +389,138 @@ class URLRepository:
             DatabaseException: If database query fails
         """
         try:
-            stmt = select(URL.id).where(URL.short_code == short_code)
-            result = await self.session.execute(stmt)
-            exists = result.scalar_one_or_none() is not None
+            result = await self._execute(_SELECT_SHORT_CODE_EXISTS, {"short_code": short_code})
+            found = bool(result.scalar())
             
-            logger.debug(f"Short code '{short_code}' exists: {exists}")
-            return exists
+            logger.debug("Short code '%s' exists: %s", short_code, found)
+            return found
             
         except SQLAlchemyError as e:
-            logger.error(f"Database error checking short code existence: {e}")
+            logger.error("Database error checking short code existence: %s", e)
             raise DatabaseException(operation="check_short_code_exists", details=str(e))
     
-    async def increment_click_count(self, short_code: str) -> bool:
+    async def get_max_id(self) -> int:
+        """
+        Get the highest URL id allocated so far.
+        
+        Returns:
+            int: Largest id in the table, or 0 if it is empty
+        
+        Raises:
+            DatabaseException: If database query fails
+        """
+        try:
+            result = await self._execute(_SELECT_MAX_ID)
+            return result.scalar() or 0
+        
+        except SQLAlchemyError as e:
+            logger.error("Database error reading max URL id: %s", e)
+            raise DatabaseException(operation="get_max_id", details=str(e))
+    
+    async def filter_existing_short_codes(self, short_codes: list[str]) -> set[str]:
         """
-        Increment the click count and update last accessed timestamp.
+        Find which of several short codes are already taken, in one query.
         
         Args:
-            short_code: The short code to update
-            
+            short_codes: Candidate short codes
+        
         Returns:
-            bool: True if updated successfully, False otherwise
-            
+            set[str]: The candidates that exist in the database
+        
         Raises:
-            DatabaseException: If database update fails
+            DatabaseException: If database query fails
         """
+        if not short_codes:
+            return set()
+        
         try:
-            stmt = (
-                update(URL)
-                .where(URL.short_code == short_code)
-                .values(
-                    click_count=URL.click_count + 1,
-                    last_accessed_at=datetime.utcnow()
-                )
+            result = await self._execute(
+                _SELECT_EXISTING_SHORT_CODES,
+                {"short_codes": short_codes}
+            )
+            return set(result.scalars())
+        
+        except SQLAlchemyError as e:
+            logger.error("Database error filtering short codes: %s", e)
+            raise DatabaseException(operation="filter_existing_short_codes", details=str(e))
+    
+    async def add_click_counts(self, clicks: dict[str, int]) -> int:
+        """
+        Apply buffered click count deltas with one executemany UPDATE.
+        
+        Every short code is bound into the same UPDATE statement, so the
+        driver sends all rows together and the changes commit once.
+        last_accessed_at is set from the database clock at flush time.
+        
+        Args:
+            clicks: Mapping of short code to click delta
+        
+        Returns:
+            int: Number of URL rows updated
+        
+        Raises:
+            DatabaseException: If database update fails
+        """
+        urls = URL.__table__
+        stmt = (
+            update(urls)
+            .where(urls.c.short_code == bindparam("b_short_code"))
+            .values(
+                click_count=urls.c.click_count + bindparam("b_delta"),
+                last_accessed_at=func.now()
             )
-            result = await self.session.execute(stmt)
+        )
+        params = [
+            {"b_short_code": short_code, "b_delta": delta}
+            for short_code, delta in clicks.items()
+        ]
+        
+        try:
+            result = await self.session.execute(stmt, params)
             await self.session.commit()
             
-            updated = result.rowcount > 0
-            if updated:
-                logger.debug(f"Incremented click count for short_code='{short_code}'")
-            else:
-                logger.warning(f"No URL found to increment for short_code='{short_code}'")
-            
+            # Drivers without executemany row counts (asyncpg) report -1
+            updated = result.rowcount if result.rowcount >= 0 else len(params)
+            logger.debug("Flushed click counts for %s URL(s)", updated)
             return updated
-            
+        
         except SQLAlchemyError as e:
             await self.session.rollback()
-            logger.error(f"Database error incrementing click count: {e}")
-            raise DatabaseException(operation="increment_click_count", details=str(e))
+            logger.error("Database error applying click counts: %s", e)
+            raise DatabaseException(operation="add_click_counts", details=str(e))
     
-    async def get_url_stats(self, short_code: str) -> Optional[URL]:
+    async def get_url_stats(self, short_code: str) -> Optional[Row[Any]]:
         """
         Get URL statistics including click count and timestamps.
         
+        Selects only the columns exposed by the stats endpoint and returns a
+        plain row, so no ORM instance is constructed or tracked.
+        
         Args:
             short_code: The short code to get stats for
             
         Returns:
-            URL model instance with statistics if found, None otherwise
+            Row with short_code, original_url, click_count, created_at and
+            last_accessed_at if found, None otherwise
             
         Raises:
             DatabaseException: If database query fails
         """
         try:
-            stmt = select(URL).where(URL.short_code == short_code)
-            result = await self.session.execute(stmt)
-            url = result.scalar_one_or_none()
+            result = await self._execute(_SELECT_STATS, {"short_code": short_code})
+            stats = result.one_or_none()
             
-            if url:
+            if stats:
                 logger.debug(
-                    f"Retrieved stats for short_code='{short_code}': "
-                    f"clicks={url.click_count}"
+                    "Retrieved stats for short_code='%s': "
+                    "clicks=%s",
+                    short_code,
+                    stats.click_count
                 )
             
-            return url
+            return stats
             
         except SQLAlchemyError as e:
-            logger.error(f"Database error getting URL stats: {e}")
+            logger.error("Database error getting URL stats: %s", e)
             raise DatabaseException(operation="get_url_stats", details=str(e))
 
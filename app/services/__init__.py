@@ -2,6 +2,15 @@
 
 from app.services.url_service import URLService
 from app.services.shortener import ShortCodeGenerator
+from app.services.click_flusher import ClickCountFlusher
+from app.services.url_batch_writer import URLBatchWriter
+from app.services.code_pool import ShortCodePool
 
-__all__ = ["URLService", "ShortCodeGenerator"]
+__all__ = [
+    "URLService",
+    "ShortCodeGenerator",
+    "ClickCountFlusher",
+    "URLBatchWriter",
+    "ShortCodePool",
+]
 
@@ -0,0 +1,77 @@
+"""
+Click Count Flusher Module.
+
+This module provides the background worker that periodically moves click
+counts buffered in Redis into the database.
+"""
+
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.database import database_manager
+from app.core.redis import redis_manager
+from app.services.url_service import URLService
+
+logger = logging.getLogger(__name__)
+
+
+class ClickCountFlusher:
+    """
+    Background worker that flushes buffered click counts to the database.
+    
+    Redirects only increment counters in Redis; this worker applies the
+    accumulated deltas every CLICK_FLUSH_INTERVAL seconds so the urls table
+    receives one batched UPDATE per interval instead of one per click.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize click count flusher."""
+        self._task: asyncio.Task[None] | None = None
+    
+    def start(self) -> None:
+        """Start the periodic flush task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Click count flusher started (interval=%ss)", settings.CLICK_FLUSH_INTERVAL)
+    
+    async def stop(self) -> None:
+        """Stop the periodic flush task and flush any remaining clicks."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Final click count flush failed: %s", e)
+        
+        logger.info("Click count flusher stopped")
+    
+    async def flush(self) -> int:
+        """
+        Flush buffered click counts once.
+        
+        Returns:
+            int: Number of URL rows updated
+        """
+        async with database_manager.session_scope() as session:
+            url_service = URLService(db_session=session, redis_manager=redis_manager)
+            return await url_service.flush_click_counts()
+    
+    async def _run(self) -> None:
+        """Flush click counts every CLICK_FLUSH_INTERVAL seconds until cancelled."""
+        while True:
+            await asyncio.sleep(settings.CLICK_FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Click count flush failed: %s", e)
+
+
+# Global click count flusher instance
+click_count_flusher = ClickCountFlusher()
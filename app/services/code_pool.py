@@ -0,0 +1,109 @@
+"""
+Short Code Pool Module.
+
+This module provides the background worker that keeps a Redis list of
+random short codes already checked against the database, so the random
+strategy can hand out a code with a single LPOP.
+"""
+
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.database import database_manager
+from app.core.redis import redis_manager
+from app.repositories.url_repository import URLRepository
+from app.services.shortener import short_code_generator
+
+logger = logging.getLogger(__name__)
+
+# Redis list holding the pooled short codes
+CODE_POOL_KEY = "url:codes:pool"
+
+# Seconds between pool level checks
+_REFILL_INTERVAL = 1.0
+
+# Most codes generated and checked per refill step
+_REFILL_BATCH_SIZE = 1000
+
+
+class ShortCodePool:
+    """
+    Background worker that keeps the Redis short code pool filled.
+    
+    Codes are generated in batches, checked against the database with one
+    query per batch and appended to the pool; requests take them with LPOP,
+    which hands each pooled code to exactly one caller. A code can still be
+    taken between the check and its use (or be pushed twice by concurrent
+    workers), so callers keep their collision handling.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize short code pool."""
+        self._task: asyncio.Task[None] | None = None
+    
+    def start(self) -> None:
+        """Start the periodic refill task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Short code pool started (size=%s)", settings.SHORT_CODE_POOL_SIZE)
+    
+    async def stop(self) -> None:
+        """Stop the periodic refill task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Short code pool stopped")
+    
+    async def refill(self) -> int:
+        """
+        Top the pool up to SHORT_CODE_POOL_SIZE codes.
+        
+        Returns:
+            int: Number of codes added
+        """
+        size = await redis_manager.llen(CODE_POOL_KEY)
+        if size is None:
+            return 0
+        
+        added = 0
+        while size < settings.SHORT_CODE_POOL_SIZE:
+            candidates = list(dict.fromkeys(short_code_generator.generate_batch(
+                min(_REFILL_BATCH_SIZE, settings.SHORT_CODE_POOL_SIZE - size)
+            )))
+            
+            async with database_manager.session_scope() as session:
+                taken = await URLRepository(session).filter_existing_short_codes(candidates)
+            
+            codes = [code for code in candidates if code not in taken]
+            if not codes:
+                # Every candidate taken: the code space is nearly full
+                break
+            
+            new_size = await redis_manager.rpush(CODE_POOL_KEY, *codes)
+            if new_size is None:
+                break
+            
+            added += len(codes)
+            size = new_size
+        
+        if added:
+            logger.debug("Added %s short code(s) to the pool", added)
+        return added
+    
+    async def _run(self) -> None:
+        """Refill the pool every _REFILL_INTERVAL seconds until cancelled."""
+        while True:
+            try:
+                await self.refill()
+            except Exception as e:
+                logger.error("Short code pool refill failed: %s", e)
+            await asyncio.sleep(_REFILL_INTERVAL)
+
+
+# Global short code pool instance
+short_code_pool = ShortCodePool()
@@ -5,14 +5,55 @@ This module provides the URL shortening algorithm using Base62 encoding
 to generate unique 5-character short codes.
 """
 
-import random
+import itertools
+import secrets
 import string
 import logging
 
 from app.core.config import settings
+from app.utils.validators import SHORT_CODE_RE
 
 logger = logging.getLogger(__name__)
 
+# Marks bytes that are not Base62 digits in a decode table
+_INVALID_DIGIT = 0xFF
+
+
+def _build_decode_table(chars: str) -> bytes:
+    """
+    Build a table mapping each byte value to its digit in chars.
+    
+    Args:
+        chars: Digit characters, in value order
+    
+    Returns:
+        bytes: 256 entries; bytes that are not digits map to _INVALID_DIGIT
+    """
+    table = bytearray([_INVALID_DIGIT]) * 256
+    for value, char in enumerate(chars):
+        table[ord(char)] = value
+    return bytes(table)
+
+
+def _build_encode_tables(chars: str) -> tuple[bytes, bytes]:
+    """
+    Build bytes.translate() tables turning random bytes into digits of chars.
+    
+    The low 6 bits of a byte select the digit; bytes whose low 6 bits are
+    not below len(chars) are deleted, so every digit stays equally likely.
+    
+    Args:
+        chars: Digit characters (at most 64)
+    
+    Returns:
+        tuple[bytes, bytes]: Translation table and bytes to delete
+    """
+    table = bytes(
+        ord(chars[byte & 0x3F]) if byte & 0x3F < len(chars) else 0 for byte in range(256)
+    )
+    rejected = bytes(byte for byte in range(256) if byte & 0x3F >= len(chars))
+    return table, rejected
+
 
 class ShortCodeGenerator:
     """
@@ -25,16 +66,28 @@ class ShortCodeGenerator:
     # Base62 character set: a-z, A-Z, 0-9
     BASE62_CHARS = string.ascii_letters + string.digits  # a-zA-Z0-9
     
+    # Digit value of each byte, so decoding is one lookup per character
+    _DECODE_TABLE = _build_decode_table(BASE62_CHARS)
+    
+    # All 3844 two-character strings in value order, so encoding emits two
+    # digits per division
+    _DIGIT_PAIRS = tuple(map("".join, itertools.product(BASE62_CHARS, repeat=2)))
+    
+    # Random byte -> Base62 character, with the 8 biased byte values deleted
+    _ENCODE_TABLE, _REJECTED_BYTES = _build_encode_tables(BASE62_CHARS)
+    
     def __init__(self) -> None:
         """Initialize short code generator."""
         self.code_length = settings.SHORT_CODE_LENGTH
+        # Number of distinct codes of code_length characters
+        self.capacity = len(self.BASE62_CHARS) ** self.code_length
     
     def generate(self) -> str:
         """
         Generate a random short code.
         
-        Uses random selection from Base62 character set to create
-        a 5-character code.
+        Uses the operating system CSPRNG, so codes cannot be predicted
+        from earlier ones.
         
         Returns:
             str: Generated short code (e.g., "aB3xY")
@@ -47,14 +100,75 @@ class ShortCodeGenerator:
             >>> all(c in ShortCodeGenerator.BASE62_CHARS for c in code)
             True
         """
-        code = ''.join(
-            random.choices(
-                self.BASE62_CHARS,
-                k=self.code_length
+        code = self.generate_batch(1)[0]
+        
+        logger.debug("Generated short code: %s", code)
+        return code
+    
+    def generate_batch(self, count: int) -> list[str]:
+        """
+        Generate several random short codes from one CSPRNG read.
+        
+        Random bytes are mapped to Base62 characters with bytes.translate();
+        the ~3% of bytes that would bias the result are dropped and made up
+        for with another read.
+        
+        Args:
+            count: Number of codes to generate
+        
+        Returns:
+            list[str]: Generated short codes (not checked for uniqueness)
+        """
+        size = count * self.code_length
+        chars = b""
+        
+        while len(chars) < size:
+            # Draw a few spare bytes to cover the rejected ones
+            missing = size - len(chars)
+            chars += secrets.token_bytes(missing + missing // 16 + 4).translate(
+                self._ENCODE_TABLE,
+                self._REJECTED_BYTES
             )
-        )
         
-        logger.debug(f"Generated short code: {code}")
+        text = chars[:size].decode("ascii")
+        return [text[i:i + self.code_length] for i in range(0, size, self.code_length)]
+    
+    def generate_from_number(self, num: int) -> str:
+        """
+        Generate the short code for a sequence number.
+        
+        Distinct numbers always give distinct codes, so codes drawn from a
+        counter never collide with each other.
+        
+        Args:
+            num: Sequence number, 0 <= num < capacity
+        
+        Returns:
+            str: Base62 encoding of num, left-padded to code_length
+        
+        Raises:
+            ValueError: If num does not fit in code_length characters
+        
+        Example:
+            >>> ShortCodeGenerator().generate_from_number(12345)
+            'aadnh'
+        """
+        if not 0 <= num < self.capacity:
+            raise ValueError(f"{num} does not fit in {self.code_length} Base62 characters")
+        
+        # The width is fixed, so emit exactly code_length digits (leading
+        # zeros included) from the pair table instead of encoding and padding
+        pairs = self._DIGIT_PAIRS
+        pair_base = len(self.BASE62_CHARS) ** 2
+        code = ""
+        
+        for _ in range(self.code_length // 2):
+            num, remainder = divmod(num, pair_base)
+            code = pairs[remainder] + code
+        
+        if self.code_length % 2:
+            code = self.BASE62_CHARS[num] + code
+        
         return code
     
     def is_valid(self, code: str) -> bool:
@@ -76,10 +190,7 @@ class ShortCodeGenerator:
             >>> generator.is_valid("aB3x!")
             False
         """
-        if len(code) != self.code_length:
-            return False
-        
-        return all(c in self.BASE62_CHARS for c in code)
+        return SHORT_CODE_RE.fullmatch(code) is not None
     
     @staticmethod
     def encode_number(num: int) -> str:
@@ -97,19 +208,26 @@ class ShortCodeGenerator:
             
         Example:
             >>> ShortCodeGenerator.encode_number(12345)
-            '3D7'
+            'dnh'
             >>> ShortCodeGenerator.encode_number(916132831)  # Max for 5 chars
-            'zzzzz'
+            '99999'
         """
-        if num == 0:
-            return ShortCodeGenerator.BASE62_CHARS[0]
+        chars = ShortCodeGenerator.BASE62_CHARS
+        base = len(chars)
+        if num < base:
+            return chars[num]
         
+        pairs = ShortCodeGenerator._DIGIT_PAIRS
+        pair_base = base * base
         result = []
-        base = len(ShortCodeGenerator.BASE62_CHARS)
         
-        while num > 0:
-            num, remainder = divmod(num, base)
-            result.append(ShortCodeGenerator.BASE62_CHARS[remainder])
+        # Two digits per divmod, least significant pair first
+        while num >= pair_base:
+            num, remainder = divmod(num, pair_base)
+            result.append(pairs[remainder])
+        
+        # Leading one or two digits, without a zero pad
+        result.append(pairs[num] if num >= base else chars[num])
         
         return ''.join(reversed(result))
     
@@ -124,15 +242,26 @@ class ShortCodeGenerator:
         Returns:
             int: Decoded number
             
+        Raises:
+            ValueError: If code contains a character outside the Base62 set
+        
         Example:
-            >>> ShortCodeGenerator.decode_to_number('3D7')
+            >>> ShortCodeGenerator.decode_to_number('dnh')
             12345
         """
+        table = ShortCodeGenerator._DECODE_TABLE
         base = len(ShortCodeGenerator.BASE62_CHARS)
         num = 0
         
-        for char in code:
-            num = num * base + ShortCodeGenerator.BASE62_CHARS.index(char)
+        # Non-ASCII characters raise UnicodeEncodeError, a ValueError
+        for byte in code.encode("ascii"):
+            digit = table[byte]
+            if digit == _INVALID_DIGIT:
+                raise ValueError(f"Invalid Base62 character: {chr(byte)!r}")
+            num = num * base + digit
         
         return num
 
+
+# Global short code generator instance
+short_code_generator = ShortCodeGenerator()
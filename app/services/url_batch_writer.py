@@ -0,0 +1,185 @@
+"""
+URL Batch Writer Module.
+
+This module provides a background writer that coalesces concurrent URL
+inserts from the shorten endpoint into multi-row upsert statements.
+"""
+
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.database import database_manager
+from app.models.url import URL
+from app.repositories.url_repository import URLRepository
+
+logger = logging.getLogger(__name__)
+
+# Pending submission: (original_url, short_code, future for the stored row)
+_QueueItem = tuple[str, str, asyncio.Future[URL | None]]
+
+
+class URLBatchWriter:
+    """
+    Background writer that batches URL inserts.
+    
+    Callers submit (original_url, short_code) pairs and await the created
+    row. A single consumer task waits SHORTEN_BATCH_WINDOW_MS after the first
+    pending item, then writes up to SHORTEN_BATCH_MAX_SIZE items with one
+    upsert and one commit; URLs that are already stored resolve to their
+    existing row. If the batch fails (e.g. a short code collision), items
+    are retried one by one so a single conflict does not fail the whole
+    batch; an item whose short code is taken resolves to None. Stopping enqueues a sentinel behind the pending items, so the
+    consumer writes every accepted submission before it exits.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize URL batch writer."""
+        self._queue: asyncio.Queue[_QueueItem | None] | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = False
+    
+    @property
+    def running(self) -> bool:
+        """Check if the writer task is accepting submissions."""
+        return self._task is not None and not self._task.done() and not self._stopping
+    
+    def start(self) -> None:
+        """Start the batch writer task."""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                "URL batch writer started (window=%sms, max_size=%s)",
+                settings.SHORTEN_BATCH_WINDOW_MS,
+                settings.SHORTEN_BATCH_MAX_SIZE
+            )
+    
+    async def stop(self) -> None:
+        """Stop the batch writer task after writing any pending items."""
+        if self._task is None or self._queue is None:
+            return
+        
+        # Reject new submissions, then let the consumer finish the batch it
+        # holds and everything queued before the sentinel
+        self._stopping = True
+        self._queue.put_nowait(None)
+        try:
+            await self._task
+        except Exception as e:
+            logger.error("URL batch writer failed: %s", e)
+        self._task = None
+        
+        # Only reached with items left if the consumer died
+        pending = self._drain(self._queue.qsize())
+        if pending:
+            await self._write(pending)
+        self._queue = None
+        
+        logger.info("URL batch writer stopped")
+    
+    async def submit(self, original_url: str, short_code: str) -> URL | None:
+        """
+        Queue a URL mapping for insertion and wait until it is written.
+        
+        Args:
+            original_url: The original URL to be shortened
+            short_code: The generated short code
+            
+        Returns:
+            URL | None: Created (or already existing) URL model instance, or
+            None if the short code is already taken by another URL
+            
+        Raises:
+            RuntimeError: If the writer is not running
+            DatabaseException: If the mapping could not be stored
+        """
+        if not self.running or self._queue is None:
+            raise RuntimeError("URLBatchWriter not running. Call start() first.")
+        
+        future: asyncio.Future[URL | None] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((original_url, short_code, future))
+        return await future
+    
+    def _drain(self, limit: int) -> list[_QueueItem]:
+        """Take up to limit items from the queue without waiting, up to the sentinel."""
+        batch = []
+        while self._queue is not None and len(batch) < limit and not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is None:
+                # Leave the sentinel for the consumer loop; nothing is
+                # queued behind it
+                self._queue.put_nowait(None)
+                break
+            batch.append(item)
+        return batch
+    
+    async def _run(self) -> None:
+        """Collect submissions into batches and write them until the sentinel."""
+        assert self._queue is not None
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            await asyncio.sleep(settings.SHORTEN_BATCH_WINDOW_MS / 1000)
+            batch = [first] + self._drain(settings.SHORTEN_BATCH_MAX_SIZE - 1)
+            await self._write(batch)
+    
+    async def _write(self, batch: list[_QueueItem]) -> None:
+        """
+        Write a batch and resolve the waiting futures.
+        
+        Args:
+            batch: (original_url, short_code, future) items to write
+        """
+        # One row per URL: concurrent requests for the same URL share it
+        pairs: dict[str, str] = {}
+        for original_url, short_code, _ in batch:
+            pairs.setdefault(original_url, short_code)
+        
+        try:
+            async with database_manager.session_scope() as session:
+                urls = await URLRepository(session).create_urls(list(pairs.items()))
+        except Exception as e:
+            logger.warning(
+                "Batch insert of %s URL(s) failed, retrying individually: %s",
+                len(batch),
+                e
+            )
+            for item in batch:
+                await self._write_one(*item)
+            return
+        
+        stored = {url.original_url: url for url in urls}
+        for original_url, _, future in batch:
+            if not future.done():
+                future.set_result(stored[original_url])
+    
+    async def _write_one(
+        self,
+        original_url: str,
+        short_code: str,
+        future: asyncio.Future[URL | None]
+    ) -> None:
+        """
+        Write a single item, returning the existing row if the URL is stored.
+        
+        Args:
+            original_url: The original URL to be shortened
+            short_code: The generated short code
+            future: Future resolved with the stored URL, None if the short
+                code is taken, or the failure
+        """
+        try:
+            async with database_manager.session_scope() as session:
+                url = await URLRepository(session).upsert_url(original_url, short_code)
+            if not future.done():
+                future.set_result(url)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+
+# Global URL batch writer instance
+url_batch_writer = URLBatchWriter()
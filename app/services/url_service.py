@@ -5,24 +5,65 @@ This module provides business logic for URL shortening operations,
 including URL validation, short code generation, caching, and statistics.
 """
 
+import asyncio
 import logging
-from typing import Optional
+import os
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Optional
+from cachetools import TTLCache
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.url import URL
 from app.repositories.url_repository import URLRepository
-from app.services.shortener import ShortCodeGenerator
+from app.services.shortener import short_code_generator
+from app.services.code_pool import CODE_POOL_KEY
 from app.core.redis import RedisManager
 from app.core.config import settings
 from app.core.exceptions import (
     URLNotFoundException,
     InvalidURLException,
     ShortCodeGenerationException,
+    DatabaseException,
 )
-from app.utils.validators import URLValidator
+from app.utils.validators import url_validator
+
+if TYPE_CHECKING:
+    from app.services.url_batch_writer import URLBatchWriter
 
 logger = logging.getLogger(__name__)
 
+# Per-worker cache of short code -> original URL in front of Redis. Mappings
+# never change once created, so entries only age out to bound memory.
+local_url_cache: TTLCache[str, str] = TTLCache(
+    maxsize=settings.LOCAL_CACHE_SIZE,
+    ttl=settings.LOCAL_CACHE_TTL
+)
+
+# Redis counter that sequence-based short codes are derived from
+_SEQUENCE_KEY = "url:id:seq"
+
+# Random short codes checked against the database per query when neither
+# the sequence nor the code pool is available
+_CODE_CANDIDATES = 8
+
+# Click counter keys requested per SCAN call and read per pipelined GETDEL
+_CLICK_SCAN_PAGE = 1000
+
+# Incremented by every click flush; stats computed before a flush are not
+# cached once it has changed
+_STATS_GENERATION_KEY = "url:stats:generation"
+
+# Cached in place of a URL for short codes that do not exist
+_NOT_FOUND_MARKER = "__MISS__"
+
+# Clicks served from local_url_cache, buffered in this worker and moved to
+# the Redis counters on the next flush
+_pending_clicks: dict[str, int] = {}
+
+# Click counter shard written by this worker process, so workers increment
+# different keys for the same hot short code
+_CLICK_SHARD = os.getpid() % settings.CLICK_COUNTER_SHARDS
+
 
 class URLService:
     """
@@ -35,7 +76,8 @@ class URLService:
     def __init__(
         self,
         db_session: AsyncSession,
-        redis_manager: RedisManager
+        redis_manager: RedisManager,
+        batch_writer: Optional["URLBatchWriter"] = None
     ) -> None:
         """
         Initialize URL service.
@@ -43,22 +85,24 @@ class URLService:
         Args:
             db_session: Database session for persistence
             redis_manager: Redis manager for caching
+            batch_writer: Optional writer that batches inserts across requests
         """
         self.repository = URLRepository(db_session)
         self.redis = redis_manager
-        self.generator = ShortCodeGenerator()
-        self.validator = URLValidator()
+        self.batch_writer = batch_writer
+        # Stateless helpers shared by all requests
+        self.generator = short_code_generator
+        self.validator = url_validator
     
     async def create_short_url(self, original_url: str) -> URL:
         """
         Create a shortened URL.
         
         Steps:
-        1. Validate the original URL
-        2. Check if URL already exists (return existing if found)
-        3. Generate unique short code
-        4. Save to database
-        5. Cache in Redis
+        1. Strip surrounding whitespace and validate the original URL
+        2. Upsert the mapping with a fresh short code; an existing mapping
+           for the same URL is returned as-is in the same statement
+        3. Cache in Redis (overlapped with the batched insert)
         
         Args:
             original_url: The URL to shorten
@@ -70,46 +114,141 @@ class URLService:
             InvalidURLException: If URL is invalid
             ShortCodeGenerationException: If unable to generate unique code
         """
-        # Validate URL
-        if not self.validator.is_valid_url(original_url):
-            logger.warning(f"Invalid URL provided: {original_url}")
-            raise InvalidURLException(original_url, "Invalid URL format")
+        # Clean, then validate format and safety with a single parse
+        try:
+            original_url, _ = self.validator.clean_and_validate(original_url)
+        except InvalidURLException as e:
+            logger.warning("Rejected URL (%s): %s", e.message, original_url)
+            raise
         
-        if not self.validator.is_safe_url(original_url):
-            logger.warning(f"Unsafe URL provided: {original_url}")
-            raise InvalidURLException(original_url, "URL appears to be malicious")
+        # Store the mapping (batched with concurrent requests when a running
+        # batch writer is available)
+        if self.batch_writer is not None and self.batch_writer.running:
+            url = await self._submit_and_cache(original_url)
+        else:
+            url = await self._upsert_with_unique_short_code(original_url)
+            await self._cache_url(url.short_code, original_url)
         
-        # Check if URL already exists
-        existing_url = await self.repository.get_by_original_url(original_url)
-        if existing_url:
-            logger.info(
-                f"URL already exists: {original_url} -> {existing_url.short_code}"
+        logger.info("Stored short URL: %s -> %s", original_url, url.short_code)
+        return url
+    
+    async def create_short_urls(self, original_urls: list[str]) -> list[URL]:
+        """
+        Create shortened URLs for several URLs at once.
+        
+        All URLs are cleaned and validated first; short codes are allocated
+        with one Redis call, the mappings are upserted with one statement and
+        cached with one pipelined round trip. If a short code is taken, the
+        URLs are upserted one by one with new codes instead.
+        
+        Args:
+            original_urls: The URLs to shorten (duplicates allowed)
+        
+        Returns:
+            list[URL]: Created or existing URL model instances, in input order
+        
+        Raises:
+            InvalidURLException: If any URL is invalid; nothing is stored
+            DatabaseException: If creation fails
+            ShortCodeGenerationException: If unable to generate after max retries
+        """
+        cleaned: list[str] = []
+        for original_url in original_urls:
+            try:
+                cleaned.append(self.validator.clean_and_validate(original_url)[0])
+            except InvalidURLException as e:
+                logger.warning("Rejected URL (%s): %s", e.message, original_url)
+                raise
+        original_urls = cleaned
+        
+        unique_urls = list(dict.fromkeys(original_urls))
+        if not unique_urls:
+            return []
+        
+        short_codes = await self._allocate_short_codes(len(unique_urls))
+        try:
+            stored = await self.repository.create_urls(list(zip(unique_urls, short_codes)))
+        except DatabaseException as e:
+            # One taken code fails the whole statement; retry each URL with
+            # the per-item collision handling
+            logger.warning(
+                "Batch insert of %s URL(s) failed, retrying individually: %s",
+                len(unique_urls),
+                e.message
             )
-            # Refresh cache
-            await self._cache_url(existing_url.short_code, original_url)
-            return existing_url
+            stored = [
+                await self._upsert_with_unique_short_code(original_url)
+                for original_url in unique_urls
+            ]
         
-        # Generate unique short code
-        short_code = await self._generate_unique_short_code()
+        ttl = settings.REDIS_CACHE_TTL
+        await self.redis.pipeline_execute([
+            ("set", (self._get_cache_key(url.short_code), url.original_url, ttl))
+            for url in stored
+        ])
         
-        # Create URL mapping in database
-        url = await self.repository.create_url(original_url, short_code)
+        by_url = {url.original_url: url for url in stored}
+        logger.info("Stored %s short URL(s) in one batch", len(stored))
+        return [by_url[original_url] for original_url in original_urls]
+    
+    async def get_original_urls(self, short_codes: list[str]) -> dict[str, str]:
+        """
+        Resolve several short codes at once, without recording clicks.
         
-        # Cache in Redis
-        await self._cache_url(short_code, original_url)
+        Codes not in this worker's cache are fetched from Redis with one
+        MGET; the rest are read from the database with one query and cached
+        with one pipelined round trip.
         
-        logger.info(f"Created short URL: {original_url} -> {short_code}")
-        return url
+        Args:
+            short_codes: The short codes to resolve
+        
+        Returns:
+            dict[str, str]: Original URL by short code, for codes that exist
+        """
+        resolved: dict[str, str] = {}
+        pending: list[str] = []
+        
+        for short_code in dict.fromkeys(short_codes):
+            local_url = local_url_cache.get(short_code)
+            if local_url is not None:
+                resolved[short_code] = local_url
+            else:
+                pending.append(short_code)
+        
+        if not pending:
+            return resolved
+        
+        cached = await self.redis.mget([self._get_cache_key(code) for code in pending])
+        misses: list[str] = []
+        for short_code, cached_url in zip(pending, cached):
+            if cached_url is None:
+                misses.append(short_code)
+            elif cached_url != _NOT_FOUND_MARKER:
+                resolved[short_code] = cached_url
+        
+        if misses:
+            found = await self.repository.get_original_urls(misses)
+            if found:
+                await self.redis.pipeline_execute([
+                    ("set", (self._get_cache_key(code), url, settings.REDIS_CACHE_TTL))
+                    for code, url in found.items()
+                ])
+            resolved.update(found)
+        
+        return resolved
     
     async def get_original_url(self, short_code: str) -> str:
         """
         Get original URL from short code with caching.
         
         Implements read-through cache pattern:
-        1. Check Redis cache
-        2. If not found, query database
-        3. Update cache
-        4. Increment click count asynchronously
+        1. Check this worker's in-process cache; a hit is counted in memory
+           and reaches Redis on the next flush, so it needs no round trip
+        2. Check Redis cache; a hit records the click in Redis (flushed to
+           the database periodically) in the same Lua script call
+        3. If not found, query database
+        4. Update caches and record the click, pipelined into one round trip;
+           unknown codes are cached as not found for NEGATIVE_CACHE_TTL
         
         Args:
             short_code: The short code to resolve
@@ -120,63 +259,291 @@ class URLService:
         Raises:
             URLNotFoundException: If short code not found
         """
-        # Check cache first
+        # Hot codes are served from this worker's memory without any I/O
+        local_url = local_url_cache.get(short_code)
+        if local_url is not None:
+            self.record_click(short_code)
+            return local_url
+        
+        # Check Redis and, on a hit, record the click in one round trip
         cache_key = self._get_cache_key(short_code)
-        cached_url = await self.redis.get(cache_key)
+        cached_url = await self.redis.get_and_count(
+            cache_key,
+            self._get_click_key(short_code, _CLICK_SHARD),
+            _NOT_FOUND_MARKER
+        )
+        
+        if cached_url == _NOT_FOUND_MARKER:
+            logger.debug("Cached not-found for short_code: %s", short_code)
+            raise URLNotFoundException(short_code)
         
         if cached_url:
-            logger.debug(f"Cache hit for short_code: {short_code}")
-            # Increment click count in background
-            await self.repository.increment_click_count(short_code)
+            logger.debug("Cache hit for short_code: %s", short_code)
+            local_url_cache[short_code] = cached_url
             return cached_url
         
         # Cache miss - query database
-        logger.debug(f"Cache miss for short_code: {short_code}")
-        url = await self.repository.get_by_short_code(short_code)
+        logger.debug("Cache miss for short_code: %s", short_code)
+        original_url = await self.repository.get_original_url(short_code)
         
-        if not url:
-            logger.warning(f"Short code not found: {short_code}")
+        if not original_url:
+            logger.warning("Short code not found: %s", short_code)
+            # Remember the miss briefly so repeated lookups skip the database
+            await self.redis.set(cache_key, _NOT_FOUND_MARKER, settings.NEGATIVE_CACHE_TTL)
             raise URLNotFoundException(short_code)
         
-        # Update cache
-        await self._cache_url(short_code, url.original_url)
+        # Update caches and record the click in one round trip
+        local_url_cache[short_code] = original_url
+        await self.redis.pipeline_execute([
+            ("set", (cache_key, original_url, settings.REDIS_CACHE_TTL)),
+            ("incr", (self._get_click_key(short_code, _CLICK_SHARD),)),
+        ])
+        
+        logger.info("Resolved short code: %s -> %s", short_code, original_url)
+        return original_url
+    
+    def record_click(self, short_code: str) -> None:
+        """
+        Record a click for a short code in this worker's memory.
         
-        # Increment click count
-        await self.repository.increment_click_count(short_code)
+        The count is added to the Redis counter by flush_click_counts() and
+        from there applied to the database, so redirects never wait on a
+        write.
         
-        logger.info(f"Resolved short code: {short_code} -> {url.original_url}")
-        return url.original_url
+        Args:
+            short_code: The short code that was accessed
+        """
+        _pending_clicks[short_code] = _pending_clicks.get(short_code, 0) + 1
+    
+    async def flush_click_counts(self) -> int:
+        """
+        Flush buffered click counts from Redis to the database.
+        
+        Clicks buffered in this worker are first added to its Redis shard.
+        Each counter shard is then read and reset atomically with GETDEL,
+        pipelined one SCAN page per round trip, and the shards of a short
+        code are summed, then all deltas are applied in
+        a single transaction that also stamps last_accessed_at with the
+        database clock. If the database write fails, the deltas are added
+        back to Redis so no clicks are lost.
+        
+        Returns:
+            int: Number of URL rows updated
+        """
+        await self._push_pending_clicks()
+        
+        counts: dict[str, int] = {}
+        
+        keys = await self.redis.scan_keys(self._get_click_key("*", "*"), _CLICK_SCAN_PAGE)
+        
+        # GETDEL the counters one SCAN page per pipelined round trip
+        for start in range(0, len(keys), _CLICK_SCAN_PAGE):
+            page = keys[start:start + _CLICK_SCAN_PAGE]
+            values = await self.redis.pipeline_execute([("getdel", (key,)) for key in page])
+            if values is None:
+                # Left in Redis for the next flush
+                continue
+            
+            for key, count in zip(page, values):
+                if not count:
+                    continue
+                
+                # Keys are url:clicks:{short_code}:{shard}
+                short_code = key.split(":")[2]
+                counts[short_code] = counts.get(short_code, 0) + int(count)
+        
+        if not counts:
+            return 0
+        
+        try:
+            updated = await self.repository.add_click_counts(counts)
+        except DatabaseException:
+            for short_code, count in counts.items():
+                await self.redis.increment(self._get_click_key(short_code, _CLICK_SHARD), count)
+            raise
+        
+        # Cached statistics of these codes are now stale. Bumping the
+        # generation first stops readers that loaded the old values from
+        # caching them after the delete.
+        await self.redis.pipeline_execute([
+            ("incr", (_STATS_GENERATION_KEY,)),
+            ("delete", tuple(self._get_stats_key(short_code) for short_code in counts)),
+        ])
+        
+        logger.info("Flushed %s click(s) for %s URL(s)", sum(counts.values()), updated)
+        return updated
     
-    async def get_url_stats(self, short_code: str) -> URL:
+    async def _push_pending_clicks(self) -> None:
+        """Add this worker's in-memory click counts to its Redis shard in one round trip."""
+        if not _pending_clicks:
+            return
+        
+        pending = dict(_pending_clicks)
+        _pending_clicks.clear()
+        
+        result = await self.redis.pipeline_execute([
+            ("incrby", (self._get_click_key(short_code, _CLICK_SHARD), count))
+            for short_code, count in pending.items()
+        ])
+        
+        if result is None:
+            # Keep the clicks for the next flush
+            for short_code, count in pending.items():
+                _pending_clicks[short_code] = _pending_clicks.get(short_code, 0) + count
+    
+    async def get_url_stats(self, short_code: str) -> dict[str, Any]:
         """
         Get URL statistics.
         
+        Statistics are cached in Redis as orjson for STATS_CACHE_TTL seconds.
+        The database values only change when buffered clicks are flushed,
+        and flush_click_counts() drops the cached entries it makes stale.
+        A miss is only cached if no flush ran since before the database
+        read, so values read before a flush are never cached after it.
+        
         Args:
             short_code: The short code to get stats for
             
         Returns:
-            URL: URL model with statistics
+            dict: short_code, original_url, click_count, created_at and
+            last_accessed_at
             
         Raises:
             URLNotFoundException: If short code not found
         """
-        url = await self.repository.get_url_stats(short_code)
+        stats_key = self._get_stats_key(short_code)
+        cached = await self.redis.get_json(stats_key)
+        if cached is not None:
+            logger.debug("Stats cache hit for short_code: %s", short_code)
+            for field in ("created_at", "last_accessed_at"):
+                if cached[field] is not None:
+                    cached[field] = datetime.fromisoformat(cached[field])
+            return cached
+        
+        generation = await self.redis.get(_STATS_GENERATION_KEY) or ""
+        row = await self.repository.get_url_stats(short_code)
         
-        if not url:
-            logger.warning(f"Short code not found for stats: {short_code}")
+        if not row:
+            logger.warning("Short code not found for stats: %s", short_code)
             raise URLNotFoundException(short_code)
         
+        stats = dict(row._mapping)
+        await self.redis.set_json_if_unchanged(
+            stats_key,
+            stats,
+            _STATS_GENERATION_KEY,
+            generation,
+            settings.STATS_CACHE_TTL
+        )
+        
         logger.debug(
-            f"Retrieved stats for {short_code}: "
-            f"clicks={url.click_count}, created={url.created_at}"
+            "Retrieved stats for %s: "
+            "clicks=%s, created=%s",
+            short_code,
+            stats["click_count"],
+            stats["created_at"]
         )
-        return url
+        return stats
+    
+    async def _next_pooled_code(self) -> str | None:
+        """
+        Take a pre-checked random short code from the Redis pool.
+        
+        Returns:
+            str | None: Short code, or None when the pool is disabled, empty
+            or unavailable
+        """
+        if settings.SHORT_CODE_STRATEGY != "random" or settings.SHORT_CODE_POOL_SIZE <= 0:
+            return None
+        
+        return await self.redis.lpop(CODE_POOL_KEY)
+    
+    async def _next_sequence_code(self) -> str | None:
+        """
+        Allocate a short code from the Redis sequence.
+        
+        INCR is atomic, so concurrent workers never receive the same number
+        and no existence check is needed.
+        
+        Returns:
+            str | None: Short code, or None when the random strategy is
+            configured, Redis is unavailable or the sequence has run past
+            the code space
+        """
+        if settings.SHORT_CODE_STRATEGY != "sequence":
+            return None
+        
+        seq = await self._increment_sequence(1)
+        if seq is None:
+            logger.warning("Short code sequence unavailable, using a random code")
+            return None
+        
+        if seq >= self.generator.capacity:
+            logger.error("Short code sequence exhausted at %s, using a random code", seq)
+            return None
+        
+        return self.generator.generate_from_number(seq)
+    
+    async def _increment_sequence(self, count: int) -> int | None:
+        """
+        Take count numbers from the Redis sequence.
+        
+        A counter that starts from scratch (first use, or the key was lost
+        with a Redis flush or failover) is first moved past the highest URL
+        id. Every sequence number is spent on at most one insert attempt and
+        each attempt draws an id, so this skips the numbers already issued.
+        Codes stored some other way (e.g. random ones) can still be hit;
+        callers retry on a collision.
+        
+        Args:
+            count: Numbers to take
+        
+        Returns:
+            int | None: Last number taken, or None if Redis is unavailable
+        """
+        last = await self.redis.increment(_SEQUENCE_KEY, count)
+        if last != count:
+            return last
+        
+        offset = await self.repository.get_max_id()
+        if offset:
+            logger.info("Seeding short code sequence past URL id %s", offset)
+            last = await self.redis.increment(_SEQUENCE_KEY, offset)
+        return last
+    
+    async def _allocate_short_codes(self, count: int) -> list[str]:
+        """
+        Allocate short codes for a batch of new URLs.
+        
+        A block of count numbers is taken from the Redis sequence with one
+        INCRBY; random codes are used when that is not possible.
+        
+        Args:
+            count: Number of codes to allocate
+        
+        Returns:
+            list[str]: Short codes (random ones are not checked for collisions)
+        """
+        if settings.SHORT_CODE_STRATEGY == "sequence":
+            last = await self._increment_sequence(count)
+            if last is not None and last < self.generator.capacity:
+                return [
+                    self.generator.generate_from_number(seq)
+                    for seq in range(last - count + 1, last + 1)
+                ]
+            logger.warning("Short code sequence unavailable, using random codes")
+        
+        return self.generator.generate_batch(count)
     
     async def _generate_unique_short_code(self) -> str:
         """
-        Generate a unique short code with collision detection.
+        Generate a unique short code.
         
-        Attempts to generate a unique code, retrying if collision occurs.
+        Codes come from the Redis sequence or the pre-checked code pool when
+        available. Otherwise a batch of random candidates is checked against
+        the database in one query, skipping those already in the local URL
+        cache, and the first free one is used; a fresh batch is tried if all
+        of them collide.
         
         Returns:
             str: Unique short code
@@ -184,45 +551,180 @@ class URLService:
         Raises:
             ShortCodeGenerationException: If unable to generate after max retries
         """
+        short_code = await self._next_sequence_code() or await self._next_pooled_code()
+        if short_code is not None:
+            return short_code
+        
         max_retries = settings.MAX_COLLISION_RETRIES
         
         for attempt in range(max_retries):
-            short_code = self.generator.generate()
+            # Codes in this worker's URL cache are known to be taken, so only
+            # unseen candidates are checked, together in one query
+            candidates = [
+                code for code in self.generator.generate_batch(_CODE_CANDIDATES)
+                if code not in local_url_cache
+            ]
+            if not candidates:
+                # Every candidate is known to be taken: draw again without a query
+                logger.warning(
+                    "All %s short code candidates cached locally "
+                    "(attempt %s/%s)",
+                    _CODE_CANDIDATES,
+                    attempt + 1,
+                    max_retries
+                )
+                continue
             
-            # Check if code already exists
-            exists = await self.repository.check_short_code_exists(short_code)
+            taken = await self.repository.filter_existing_short_codes(candidates)
             
-            if not exists:
-                logger.debug(
-                    f"Generated unique short code: {short_code} "
-                    f"(attempt {attempt + 1}/{max_retries})"
-                )
-                return short_code
+            for short_code in candidates:
+                if short_code not in taken:
+                    logger.debug(
+                        "Generated unique short code: %s "
+                        "(attempt %s/%s)",
+                        short_code,
+                        attempt + 1,
+                        max_retries
+                    )
+                    return short_code
             
             logger.warning(
-                f"Short code collision: {short_code} "
-                f"(attempt {attempt + 1}/{max_retries})"
+                "All %s short code candidates collided "
+                "(attempt %s/%s)",
+                _CODE_CANDIDATES,
+                attempt + 1,
+                max_retries
             )
         
         # Failed to generate unique code
-        logger.error(f"Failed to generate unique short code after {max_retries} attempts")
+        logger.error("Failed to generate unique short code after %s attempts", max_retries)
+        raise ShortCodeGenerationException(max_retries)
+    
+    async def _upsert_with_unique_short_code(self, original_url: str) -> URL:
+        """
+        Upsert a URL mapping, retrying with a new code on collision.
+        
+        The collision check is the upsert itself, so a new or already
+        shortened URL takes a single statement in the common case. Sequence
+        codes only collide with codes stored before the sequence reached
+        them (e.g. earlier random codes); the next number is tried then.
+        
+        Args:
+            original_url: The URL to shorten
+        
+        Returns:
+            URL: Created or existing URL model instance
+        
+        Raises:
+            ShortCodeGenerationException: If unable to generate after max retries
+        """
+        max_retries = settings.MAX_COLLISION_RETRIES
+        
+        for attempt in range(max_retries):
+            short_code = (
+                await self._next_sequence_code()
+                or await self._next_pooled_code()
+                or self.generator.generate()
+            )
+            
+            url = await self.repository.upsert_url(original_url, short_code)
+            if url is not None:
+                return url
+            
+            logger.warning(
+                "Short code collision: %s "
+                "(attempt %s/%s)",
+                short_code,
+                attempt + 1,
+                max_retries
+            )
+        
+        logger.error("Failed to generate unique short code after %s attempts", max_retries)
+        raise ShortCodeGenerationException(max_retries)
+    
+    async def _submit_and_cache(self, original_url: str) -> URL:
+        """
+        Store a URL through the batch writer while caching it in Redis.
+        
+        The short code is unique before the insert, so the cache write runs
+        concurrently with the batched insert instead of after it. The cache
+        entry is only created if the key is free, and is removed again if the
+        insert fails or the URL turns out to be stored under another code.
+        If the key held a not-found marker, it is overwritten once the insert
+        has returned the stored row. A code that turns out to be taken (e.g.
+        a sequence code that reached a stored random code) is replaced with
+        a new one.
+        
+        Args:
+            original_url: The URL to shorten
+        
+        Returns:
+            URL: Created or existing URL model instance
+        
+        Raises:
+            ShortCodeGenerationException: If unable to generate after max retries
+        """
+        assert self.batch_writer is not None
+        max_retries = settings.MAX_COLLISION_RETRIES
+        
+        for attempt in range(max_retries):
+            short_code = await self._generate_unique_short_code()
+            
+            stored, cached = await asyncio.gather(
+                self.batch_writer.submit(original_url, short_code),
+                self._cache_url(short_code, original_url, nx=True),
+                return_exceptions=True
+            )
+            
+            if isinstance(stored, URL) and stored.short_code == short_code:
+                # NX leaves a not-found marker from an earlier lookup in place;
+                # the row is stored now, so replace it
+                if cached is not True:
+                    await self._cache_url(short_code, original_url)
+                return stored
+            
+            # Undo the speculative entry
+            if cached is True:
+                await self.redis.delete(self._get_cache_key(short_code))
+            
+            if isinstance(stored, BaseException):
+                raise stored
+            
+            if stored is not None:
+                await self._cache_url(stored.short_code, original_url)
+                return stored
+            
+            logger.warning(
+                "Short code collision: %s "
+                "(attempt %s/%s)",
+                short_code,
+                attempt + 1,
+                max_retries
+            )
+        
+        logger.error("Failed to generate unique short code after %s attempts", max_retries)
         raise ShortCodeGenerationException(max_retries)
     
-    async def _cache_url(self, short_code: str, original_url: str) -> None:
+    async def _cache_url(self, short_code: str, original_url: str, nx: bool = False) -> bool:
         """
         Cache URL mapping in Redis.
         
         Args:
             short_code: The short code
             original_url: The original URL
+            nx: Only cache if the key does not exist yet
+        
+        Returns:
+            bool: True if the mapping was written, False otherwise
         """
         cache_key = self._get_cache_key(short_code)
-        success = await self.redis.set(cache_key, original_url)
+        success = await self.redis.set(cache_key, original_url, nx=nx)
         
         if success:
-            logger.debug(f"Cached URL: {cache_key} -> {original_url}")
+            logger.debug("Cached URL: %s -> %s", cache_key, original_url)
         else:
-            logger.warning(f"Failed to cache URL: {cache_key}")
+            logger.warning("Failed to cache URL: %s", cache_key)
+        return success
     
     @staticmethod
     def _get_cache_key(short_code: str) -> str:
@@ -236,4 +738,30 @@ class URLService:
             str: Cache key
         """
         return f"url:short:{short_code}"
-
+    
+    @staticmethod
+    def _get_stats_key(short_code: str) -> str:
+        """
+        Get Redis key for a short code's cached statistics.
+        
+        Args:
+            short_code: The short code
+        
+        Returns:
+            str: Stats cache key
+        """
+        return f"url:stats:{short_code}"
+    
+    @staticmethod
+    def _get_click_key(short_code: str, shard: int | str) -> str:
+        """
+        Get Redis key for one shard of a short code's buffered click counter.
+        
+        Args:
+            short_code: The short code
+            shard: Counter shard number
+        
+        Returns:
+            str: Click counter key
+        """
+        return f"url:clicks:{short_code}:{shard}"
@@ -7,13 +7,23 @@ patterns, and ensuring URL safety.
 
 import re
 import logging
-from urllib.parse import urlparse
-from typing import List
+import ipaddress
+from functools import lru_cache
+from urllib.parse import ParseResult, urlparse
+from typing import Tuple
 
 from app.core.config import settings
+from app.core.exceptions import InvalidURLException
 
 logger = logging.getLogger(__name__)
 
+# Limits read from settings once at import
+_MAX_URL_LENGTH = settings.MAX_URL_LENGTH
+
+# A complete short code: exactly SHORT_CODE_LENGTH ASCII Base62 characters.
+# Shared with ShortCodeGenerator.is_valid so both checks accept the same codes.
+SHORT_CODE_RE = re.compile(rf"[a-zA-Z0-9]{{{settings.SHORT_CODE_LENGTH}}}")
+
 
 class URLValidator:
     """
@@ -23,22 +33,70 @@ class URLValidator:
     and ensure URLs are safe to process.
     """
     
-    # Blocked domains/patterns (for security)
-    BLOCKED_PATTERNS: List[str] = [
-        r"localhost",
-        r"127\.0\.0\.1",
-        r"0\.0\.0\.0",
-        r"169\.254\.",  # Link-local addresses
-        r"10\.",        # Private network
-        r"172\.1[6-9]\.",  # Private network
-        r"172\.2[0-9]\.",  # Private network
-        r"172\.3[0-1]\.",  # Private network
-        r"192\.168\.",  # Private network
-    ]
+    # Blocked host labels (for security), matched against the lowercased
+    # host as whole-label prefixes at every "." or "-" boundary, not just
+    # at the start. IP literals are checked by address range instead, see
+    # _is_blocked_ip(); these catch hostnames that embed a private address,
+    # e.g. "10.0.0.1.nip.io", "a.10.0.0.1.nip.io" or "x-127.0.0.1.example",
+    # and subdomains of localhost, which resolve to loopback (RFC 6761)
+    BLOCKED_HOST_LABELS: Tuple[str, ...] = (
+        "localhost",
+        "127.0.0.1",
+        "0.0.0.0",
+        "169.254.",  # Link-local addresses
+        "10.",       # Private network
+        "192.168.",  # Private network
+    ) + tuple(f"172.{octet}." for octet in range(16, 32))  # Private network
+    
+    # Substrings searched in "." + host with "-" mapped to "."
+    _BLOCKED_HOST_NEEDLES: Tuple[str, ...] = tuple("." + label for label in BLOCKED_HOST_LABELS)
     
     # Allowed schemes
     ALLOWED_SCHEMES = ["http", "https"]
     
+    def validate(self, url: str) -> ParseResult:
+        """
+        Validate URL format and safety, parsing the URL only once.
+        
+        Args:
+            url: URL to validate
+        
+        Returns:
+            ParseResult: The parsed URL
+        
+        Raises:
+            InvalidURLException: If the URL is malformed or points to a
+                blocked host
+        """
+        parsed = self._parse(url)
+        if parsed is None or not self._has_valid_format(parsed):
+            raise InvalidURLException(url, "Invalid URL format")
+        
+        if not self._has_safe_host(url, parsed):
+            raise InvalidURLException(url, "URL appears to be malicious")
+        
+        return parsed
+    
+    def clean_and_validate(self, url: str) -> tuple[str, ParseResult]:
+        """
+        Strip surrounding whitespace from a URL, then validate it.
+        
+        The cleaned URL is parsed once for all checks. No scheme is added:
+        scheme-less input is rejected rather than guessed at.
+        
+        Args:
+            url: URL to clean and validate
+        
+        Returns:
+            tuple[str, ParseResult]: The cleaned URL and its parsed form
+        
+        Raises:
+            InvalidURLException: If the URL is malformed or points to a
+                blocked host
+        """
+        clean_url = url.strip() if isinstance(url, str) else url
+        return clean_url, self.validate(clean_url)
+    
     def is_valid_url(self, url: str) -> bool:
         """
         Validate URL format and basic requirements.
@@ -49,24 +107,66 @@ class URLValidator:
         Returns:
             bool: True if valid, False otherwise
         """
-        if not url or not isinstance(url, str):
+        parsed = self._parse(url)
+        return parsed is not None and self._has_valid_format(parsed)
+    
+    def is_safe_url(self, url: str) -> bool:
+        """
+        Check if URL is safe (not pointing to blocked domains or local resources).
+        
+        Helps prevent SSRF (Server-Side Request Forgery) attacks.
+        
+        Args:
+            url: URL to check
+            
+        Returns:
+            bool: True if safe, False otherwise
+        """
+        try:
+            return self._has_safe_host(url, urlparse(url))
+        except Exception as e:
+            logger.warning("Error checking URL safety: %s", e)
             return False
+    
+    @staticmethod
+    def _parse(url: str) -> ParseResult | None:
+        """
+        Check URL type and length, then parse it.
+        
+        Args:
+            url: URL to parse
+        
+        Returns:
+            ParseResult | None: Parsed URL, or None if it cannot be used
+        """
+        if not url or not isinstance(url, str):
+            return None
         
         # Check length
-        if len(url) > settings.MAX_URL_LENGTH:
-            logger.warning(f"URL exceeds maximum length: {len(url)} > {settings.MAX_URL_LENGTH}")
-            return False
+        if len(url) > _MAX_URL_LENGTH:
+            logger.warning("URL exceeds maximum length: %s > %s", len(url), _MAX_URL_LENGTH)
+            return None
         
         # Parse URL
         try:
-            parsed = urlparse(url)
+            return urlparse(url)
         except Exception as e:
-            logger.warning(f"Failed to parse URL: {e}")
-            return False
+            logger.warning("Failed to parse URL: %s", e)
+            return None
+    
+    def _has_valid_format(self, parsed: ParseResult) -> bool:
+        """
+        Check the scheme and domain of a parsed URL.
+        
+        Args:
+            parsed: Parsed URL
         
+        Returns:
+            bool: True if valid, False otherwise
+        """
         # Check scheme
         if parsed.scheme not in self.ALLOWED_SCHEMES:
-            logger.warning(f"Invalid URL scheme: {parsed.scheme}")
+            logger.warning("Invalid URL scheme: %s", parsed.scheme)
             return False
         
         # Check if domain exists
@@ -76,37 +176,95 @@ class URLValidator:
         
         return True
     
-    def is_safe_url(self, url: str) -> bool:
+    def _has_safe_host(self, url: str, parsed: ParseResult) -> bool:
         """
-        Check if URL is safe (not pointing to blocked domains or local resources).
-        
-        Helps prevent SSRF (Server-Side Request Forgery) attacks.
+        Check the host of a parsed URL against blocked addresses and patterns.
         
         Args:
-            url: URL to check
-            
+            url: Original URL, for logging
+            parsed: Parsed URL
+        
         Returns:
             bool: True if safe, False otherwise
         """
-        try:
-            parsed = urlparse(url)
-            host = parsed.netloc.lower()
-            
-            # Remove port if present
-            if ":" in host:
-                host = host.split(":")[0]
-            
-            # Check against blocked patterns
-            for pattern in self.BLOCKED_PATTERNS:
-                if re.search(pattern, host, re.IGNORECASE):
-                    logger.warning(f"URL blocked by pattern '{pattern}': {url}")
-                    return False
-            
-            return True
-            
-        except Exception as e:
-            logger.warning(f"Error checking URL safety: {e}")
+        # Lowercased, without userinfo, port or IPv6 brackets
+        host = parsed.hostname or ""
+        
+        if self._is_blocked_host(host):
+            logger.warning("URL blocked by host '%s': %s", host, url)
             return False
+        
+        return True
+    
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _is_blocked_host(host: str) -> bool:
+        """
+        Check a host against blocked addresses and hostname labels.
+        
+        The answer depends only on the host, and most traffic goes to a
+        small set of hosts, so results are memoized.
+        
+        Args:
+            host: Lowercased hostname from the URL
+        
+        Returns:
+            bool: True if the host is blocked, False otherwise
+        """
+        # IP literals: a few integer range tests
+        ip = URLValidator._parse_ip(host)
+        if ip is not None:
+            return URLValidator._is_blocked_ip(ip)
+        
+        # Hostnames: a blocked label after any "." or "-" boundary, found
+        # with plain substring search
+        bounded = "." + host.replace("-", ".")
+        return any(needle in bounded for needle in URLValidator._BLOCKED_HOST_NEEDLES)
+    
+    @staticmethod
+    def _parse_ip(host: str) -> ipaddress.IPv4Address | ipaddress.IPv6Address | None:
+        """
+        Parse a host as an IP address literal.
+        
+        Args:
+            host: Hostname from the URL
+        
+        Returns:
+            IP address, or None if host is not an IP literal. Decimal hosts
+            such as "2130706433" are read as IPv4 addresses, the way
+            browsers and HTTP clients resolve them.
+        """
+        try:
+            if host.isdigit():
+                return ipaddress.IPv4Address(int(host))
+            return ipaddress.ip_address(host)
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _is_blocked_ip(ip: ipaddress.IPv4Address | ipaddress.IPv6Address) -> bool:
+        """
+        Check if an IP address is outside the public address space.
+        
+        Args:
+            ip: IP address to check
+        
+        Returns:
+            bool: True for private, loopback, link-local, reserved,
+            unspecified and multicast addresses
+        """
+        # ::ffff:a.b.c.d reaches the embedded IPv4 address
+        if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        
+        return (
+            ip.is_private
+            or ip.is_loopback
+            or ip.is_link_local
+            or ip.is_reserved
+            or ip.is_unspecified
+            or ip.is_multicast
+        )
     
     def is_valid_short_code(self, code: str) -> bool:
         """
@@ -121,11 +279,9 @@ class URLValidator:
         if not code or not isinstance(code, str):
             return False
         
-        if len(code) != settings.SHORT_CODE_LENGTH:
-            return False
-        
-        # Check if alphanumeric
-        return code.isalnum()
+        # ASCII letters and digits only; str.isalnum() also accepts non-ASCII
+        # letters and digits
+        return SHORT_CODE_RE.fullmatch(code) is not None
     
     def sanitize_url(self, url: str) -> str:
         """
@@ -146,3 +302,6 @@ class URLValidator:
         
         return url
 
+
+# Global URL validator instance
+url_validator = URLValidator()
@@ -4,38 +4,58 @@ Pytest Configuration and Fixtures.
 This module provides test fixtures for database, Redis, and FastAPI client setup.
 """
 
+import asyncio
+
 import pytest
 import pytest_asyncio
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import StaticPool
 from httpx import AsyncClient
-from fakeredis import aioredis as fake_aioredis
+from fakeredis import FakeServer, aioredis as fake_aioredis
 
 from app.main import app
 from app.core.database import Base, get_db
+from app.core.dependencies import get_database_session
 from app.core.redis import redis_manager
 from app.core.config import settings
+from app.services.url_service import URLService, _pending_clicks, local_url_cache
 
 # Test database URL (SQLite for testing)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
 @pytest.fixture(scope="session")
-def event_loop():
+def event_loop_policy():
+    """Run async tests on uvloop, as in production, when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def event_loop(event_loop_policy):
     """Create event loop for async tests."""
-    import asyncio
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+    loop = event_loop_policy.new_event_loop()
     yield loop
     loop.close()
 
 
 @pytest_asyncio.fixture
 async def test_engine():
-    """Create test database engine."""
+    """
+    Create test database engine.
+    
+    Every in-memory SQLite connection is a separate empty database, so the
+    engine holds a single shared connection: tables created here are seen
+    by every session and the test pays for one connect.
+    """
     engine = create_async_engine(
         TEST_DATABASE_URL,
-        poolclass=NullPool,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
         echo=False,
     )
     
@@ -68,17 +88,29 @@ async def test_db_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
 @pytest_asyncio.fixture
 async def fake_redis():
     """Create fake Redis client for testing."""
-    fake_redis_client = fake_aioredis.FakeRedis(decode_responses=True)
+    server = FakeServer()
+    fake_redis_client = fake_aioredis.FakeRedis(server=server, decode_responses=True)
+    fake_binary_client = fake_aioredis.FakeRedis(server=server, decode_responses=False)
     
-    # Replace redis_manager client
-    original_client = redis_manager._client
+    # Replace redis_manager clients and start from empty worker-local state
+    original_clients = redis_manager._client, redis_manager._binary_client
     redis_manager._client = fake_redis_client
+    redis_manager._binary_client = fake_binary_client
+    local_url_cache.clear()
+    _pending_clicks.clear()
     
     yield fake_redis_client
     
-    # Restore original client
-    redis_manager._client = original_client
+    # Restore original clients
+    redis_manager._client, redis_manager._binary_client = original_clients
     await fake_redis_client.close()
+    await fake_binary_client.close()
+
+
+@pytest_asyncio.fixture
+async def url_service(test_db_session, fake_redis) -> URLService:
+    """Create URL service bound to the test database session and fake Redis."""
+    return URLService(db_session=test_db_session, redis_manager=redis_manager)
 
 
 @pytest_asyncio.fixture
@@ -89,6 +121,7 @@ async def test_client(test_db_session, fake_redis) -> AsyncGenerator[AsyncClient
         yield test_db_session
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_database_session] = override_get_db
     
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
@@ -107,15 +140,14 @@ def sample_urls():
     ]
 
 
-@pytest.fixture
-def invalid_urls():
-    """Invalid URLs for testing."""
-    return [
-        "",
-        "not-a-url",
-        "http://",
-        "ftp://invalid-protocol.com",
-        "http://localhost/local-resource",  # Should be blocked
-        "http://127.0.0.1/internal",  # Should be blocked
-    ]
-
+@pytest.fixture(params=[
+    "",
+    "not-a-url",
+    "http://",
+    "ftp://invalid-protocol.com",
+    "http://localhost/local-resource",  # Should be blocked
+    "http://127.0.0.1/internal",  # Should be blocked
+])
+def invalid_url(request):
+    """Invalid URL for testing, one test case per URL."""
+    return request.param
@@ -7,6 +7,9 @@ Tests for request validation, error handling, and edge cases.
 import pytest
 from httpx import AsyncClient
 
+from app.core.exceptions import DatabaseException, ShortCodeGenerationException
+from app.services.url_service import URLService
+
 
 @pytest.mark.asyncio
 async def test_shorten_url_success(test_client: AsyncClient, sample_urls):
@@ -66,6 +69,12 @@ async def test_shorten_url_malicious_url(test_client: AsyncClient):
         "http://localhost/admin",
         "http://127.0.0.1/internal",
         "http://192.168.1.1/router",
+        "http://[::1]/admin",
+        "http://2130706433/internal",  # 127.0.0.1 in decimal
+        "http://10.0.0.1.nip.io/internal",  # Private address as leading labels
+        "http://a.10.0.0.1.nip.io/internal",  # ... or embedded after a "."
+        "http://x-127.0.0.1.example/internal",  # ... or after a "-"
+        "http://api.localhost/admin",
     ]
     
     for url in malicious_urls:
@@ -76,6 +85,17 @@ async def test_shorten_url_malicious_url(test_client: AsyncClient):
         assert response.status_code in [400, 422]
 
 
+@pytest.mark.asyncio
+async def test_shorten_url_digits_inside_label_allowed(test_client: AsyncClient):
+    """Test that blocked addresses only match whole labels, not any substring."""
+    for url in ["https://app10.example.com/page", "https://my172.16.example.com/page"]:
+        response = await test_client.post(
+            "/api/v1/urls/shorten",
+            json={"original_url": url}
+        )
+        assert response.status_code == 201
+
+
 @pytest.mark.asyncio
 async def test_get_url_stats_success(test_client: AsyncClient, sample_urls):
     """Test getting URL statistics."""
@@ -159,3 +179,32 @@ async def test_maximum_url_length(test_client: AsyncClient):
     # Should be rejected with validation error or bad request
     assert response.status_code in [400, 422]
 
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("exc, detail", [
+    (
+        ShortCodeGenerationException(retries=3),
+        "Unable to generate unique short code. Please try again.",
+    ),
+    (DatabaseException(operation="upsert_url"), "An unexpected error occurred"),
+])
+async def test_server_errors_hide_internal_messages(
+    test_client: AsyncClient,
+    monkeypatch,
+    sample_urls,
+    exc,
+    detail
+):
+    """Test that service errors with a 5xx status return a client-facing detail."""
+    async def fail(self, original_url):
+        raise exc
+    
+    monkeypatch.setattr(URLService, "create_short_url", fail)
+    response = await test_client.post(
+        "/api/v1/urls/shorten",
+        json={"original_url": sample_urls[0]}
+    )
+    
+    assert response.status_code == 500
+    assert response.json()["detail"] == detail
@@ -5,18 +5,14 @@ Tests for URL redirection, click counting, and cache behavior.
 """
 
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.services.url_service import URLService
-from app.repositories.url_repository import URLRepository
+from app.core.redis import redis_manager
 from app.core.exceptions import URLNotFoundException
 
 
 @pytest.mark.asyncio
-async def test_successful_redirect(test_db_session: AsyncSession, fake_redis, sample_urls):
+async def test_successful_redirect(url_service, sample_urls):
     """Test successful URL redirect."""
-    url_service = URLService(db_session=test_db_session, redis_manager=fake_redis)
-    
     original_url = sample_urls[0]
     
     # Create short URL
@@ -29,19 +25,33 @@ async def test_successful_redirect(test_db_session: AsyncSession, fake_redis, sa
 
 
 @pytest.mark.asyncio
-async def test_nonexistent_short_code(test_db_session: AsyncSession, fake_redis):
+async def test_nonexistent_short_code(url_service):
     """Test accessing non-existent short code returns 404."""
-    url_service = URLService(db_session=test_db_session, redis_manager=fake_redis)
+    with pytest.raises(URLNotFoundException):
+        await url_service.get_original_url("XXXXX")
+
+
+@pytest.mark.asyncio
+async def test_nonexistent_short_code_is_negatively_cached(url_service, fake_redis, monkeypatch):
+    """Test that a not-found short code is answered from Redis on the next lookup."""
+    with pytest.raises(URLNotFoundException):
+        await url_service.get_original_url("XXXXX")
+    
+    async def fail_lookup(short_code):
+        raise AssertionError("database should not be queried")
+    
+    monkeypatch.setattr(url_service.repository, "get_original_url", fail_lookup)
     
     with pytest.raises(URLNotFoundException):
         await url_service.get_original_url("XXXXX")
+    
+    assert await fake_redis.keys("url:clicks:*") == []
 
 
 @pytest.mark.asyncio
-async def test_click_count_increment(test_db_session: AsyncSession, fake_redis, sample_urls):
+async def test_click_count_increment(url_service, sample_urls):
     """Test that click count increments on each access."""
-    url_service = URLService(db_session=test_db_session, redis_manager=fake_redis)
-    repository = URLRepository(test_db_session)
+    repository = url_service.repository
     
     original_url = sample_urls[0]
     
@@ -52,20 +62,41 @@ async def test_click_count_increment(test_db_session: AsyncSession, fake_redis,
     for i in range(5):
         await url_service.get_original_url(created_url.short_code)
     
+    # Clicks are buffered in Redis until flushed
+    url_stats = await repository.get_url_stats(created_url.short_code)
+    assert url_stats.click_count == 0
+    
+    await url_service.flush_click_counts()
+    
     # Check click count
     url_stats = await repository.get_url_stats(created_url.short_code)
     assert url_stats.click_count == 5
 
 
 @pytest.mark.asyncio
-async def test_last_accessed_timestamp_update(
-    test_db_session: AsyncSession,
-    fake_redis,
-    sample_urls
-):
+async def test_click_count_flush_resets_buffer(fake_redis, url_service, sample_urls):
+    """Test that flushing click counts empties the Redis buffer."""
+    repository = url_service.repository
+    
+    created_url = await url_service.create_short_url(sample_urls[0])
+    
+    for i in range(3):
+        await url_service.get_original_url(created_url.short_code)
+    
+    assert await url_service.flush_click_counts() == 1
+    assert await fake_redis.keys(f"url:clicks:{created_url.short_code}:*") == []
+    
+    # A second flush has nothing to apply
+    assert await url_service.flush_click_counts() == 0
+    
+    url_stats = await repository.get_url_stats(created_url.short_code)
+    assert url_stats.click_count == 3
+
+
+@pytest.mark.asyncio
+async def test_last_accessed_timestamp_update(url_service, sample_urls):
     """Test that last_accessed_at is updated on access."""
-    url_service = URLService(db_session=test_db_session, redis_manager=fake_redis)
-    repository = URLRepository(test_db_session)
+    repository = url_service.repository
     
     original_url = sample_urls[0]
     
@@ -76,8 +107,9 @@ async def test_last_accessed_timestamp_update(
     url_before = await repository.get_url_stats(created_url.short_code)
     assert url_before.last_accessed_at is None
     
-    # Access the URL
+    # Access the URL and flush buffered clicks
     await url_service.get_original_url(created_url.short_code)
+    await url_service.flush_click_counts()
     
     # Now last_accessed_at should be set
     url_after = await repository.get_url_stats(created_url.short_code)
@@ -85,10 +117,8 @@ async def test_last_accessed_timestamp_update(
 
 
 @pytest.mark.asyncio
-async def test_cache_hit_scenario(test_db_session: AsyncSession, fake_redis, sample_urls):
+async def test_cache_hit_scenario(url_service, fake_redis, sample_urls):
     """Test that cached URLs are retrieved from Redis."""
-    url_service = URLService(db_session=test_db_session, redis_manager=fake_redis)
-    
     original_url = sample_urls[0]
     
     # Create short URL (this caches it)
@@ -105,10 +135,9 @@ async def test_cache_hit_scenario(test_db_session: AsyncSession, fake_redis, sam
 
 
 @pytest.mark.asyncio
-async def test_cache_miss_scenario(test_db_session: AsyncSession, fake_redis, sample_urls):
+async def test_cache_miss_scenario(fake_redis, url_service, sample_urls):
     """Test that uncached URLs are retrieved from database and then cached."""
-    url_service = URLService(db_session=test_db_session, redis_manager=fake_redis)
-    repository = URLRepository(test_db_session)
+    repository = url_service.repository
     
     original_url = sample_urls[0]
     
@@ -129,3 +158,62 @@ async def test_cache_miss_scenario(test_db_session: AsyncSession, fake_redis, sa
     cached_value = await fake_redis.get(cache_key)
     assert cached_value == original_url
 
+
+
+@pytest.mark.asyncio
+async def test_json_cache_round_trip(fake_redis):
+    """Test that JSON values round-trip through the binary Redis client."""
+    value = {"short_code": "abc12", "click_count": 3}
+    
+    assert await redis_manager.set_json("url:json:abc12", value)
+    assert await redis_manager.get_json("url:json:abc12") == value
+    
+    # Both clients see the same keyspace
+    assert await fake_redis.get("url:json:abc12") is not None
+
+
+@pytest.mark.asyncio
+async def test_stats_cache_dropped_on_flush(url_service, fake_redis, sample_urls):
+    """Test that cached stats are served from Redis until clicks are flushed."""
+    created_url = await url_service.create_short_url(sample_urls[0])
+    stats_key = f"url:stats:{created_url.short_code}"
+    
+    stats = await url_service.get_url_stats(created_url.short_code)
+    assert stats["click_count"] == 0
+    assert await fake_redis.exists(stats_key)
+    
+    # A cache hit returns the same values, timestamps included
+    assert await url_service.get_url_stats(created_url.short_code) == stats
+    
+    await url_service.get_original_url(created_url.short_code)
+    await url_service.flush_click_counts()
+    assert not await fake_redis.exists(stats_key)
+    
+    stats = await url_service.get_url_stats(created_url.short_code)
+    assert stats["click_count"] == 1
+    assert stats["last_accessed_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_stats_read_before_flush_are_not_cached(
+    url_service,
+    fake_redis,
+    monkeypatch,
+    sample_urls
+):
+    """Test that stats loaded before a concurrent flush are not cached after it."""
+    created_url = await url_service.create_short_url(sample_urls[0])
+    await url_service.get_original_url(created_url.short_code)
+    
+    read_stats = url_service.repository.get_url_stats
+    
+    async def read_then_flush(short_code):
+        row = await read_stats(short_code)
+        await url_service.flush_click_counts()
+        return row
+    
+    monkeypatch.setattr(url_service.repository, "get_url_stats", read_then_flush)
+    stats = await url_service.get_url_stats(created_url.short_code)
+    
+    assert stats["click_count"] == 0
+    assert not await fake_redis.exists(f"url:stats:{created_url.short_code}")
@@ -4,20 +4,26 @@ Test URL Shortener Core Functionality.
 Tests for URL creation, validation, and database persistence.
 """
 
+import asyncio
+
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.services.url_service import URLService
-from app.services.shortener import ShortCodeGenerator
-from app.core.exceptions import InvalidURLException
+from app.services.url_service import URLService, local_url_cache
+from app.core.redis import redis_manager
+from app.services.shortener import short_code_generator
+from app.services.url_batch_writer import URLBatchWriter
+from app.services.code_pool import CODE_POOL_KEY, ShortCodePool
+from app.core.config import settings
+from app.core.database import database_manager
+from app.core.exceptions import InvalidURLException, URLNotFoundException
 from app.repositories.url_repository import URLRepository
+from app.utils.validators import URLValidator
 
 
 @pytest.mark.asyncio
-async def test_create_short_url_success(test_db_session: AsyncSession, fake_redis, sample_urls):
+async def test_create_short_url_success(url_service, sample_urls):
     """Test successful URL shortening."""
-    url_service = URLService(db_session=test_db_session, redis_manager=fake_redis)
-    
     original_url = sample_urls[0]
     url = await url_service.create_short_url(original_url)
     
@@ -30,14 +36,8 @@ async def test_create_short_url_success(test_db_session: AsyncSession, fake_redi
 
 
 @pytest.mark.asyncio
-async def test_duplicate_url_returns_same_short_code(
-    test_db_session: AsyncSession,
-    fake_redis,
-    sample_urls
-):
+async def test_duplicate_url_returns_same_short_code(url_service, sample_urls):
     """Test that shortening the same URL returns the same short code."""
-    url_service = URLService(db_session=test_db_session, redis_manager=fake_redis)
-    
     original_url = sample_urls[0]
     
     # Create first time
@@ -51,44 +51,44 @@ async def test_duplicate_url_returns_same_short_code(
 
 
 @pytest.mark.asyncio
-async def test_invalid_url_rejection(test_db_session: AsyncSession, fake_redis, invalid_urls):
-    """Test that invalid URLs are rejected."""
-    url_service = URLService(db_session=test_db_session, redis_manager=fake_redis)
+async def test_surrounding_whitespace_is_stripped(url_service, sample_urls):
+    """Test that URLs are stored without surrounding whitespace."""
+    padded = await url_service.create_short_url(f"  {sample_urls[0]}\n")
+    plain = await url_service.create_short_url(sample_urls[0])
     
-    for invalid_url in invalid_urls:
-        if invalid_url:  # Skip empty string test (different error)
-            with pytest.raises(InvalidURLException):
-                await url_service.create_short_url(invalid_url)
+    assert padded.original_url == sample_urls[0]
+    assert plain.short_code == padded.short_code
 
 
 @pytest.mark.asyncio
-async def test_short_code_generation_uniqueness(test_db_session: AsyncSession, sample_urls):
+async def test_invalid_url_rejection(url_service, invalid_url):
+    """Test that invalid URLs are rejected."""
+    with pytest.raises(InvalidURLException):
+        await url_service.create_short_url(invalid_url)
+
+
+@pytest.mark.asyncio
+async def test_short_code_generation_uniqueness(url_service, sample_urls):
     """Test that generated short codes are unique."""
-    repository = URLRepository(test_db_session)
-    generator = ShortCodeGenerator()
+    repository = url_service.repository
+    generator = short_code_generator
     
-    short_codes = set()
+    # Check all candidates in one query, then store every URL in one upsert
+    candidates = list(dict.fromkeys(generator.generate_batch(2 * len(sample_urls))))
+    taken = await repository.filter_existing_short_codes(candidates)
+    free = [code for code in candidates if code not in taken]
     
-    # Generate multiple short codes
-    for i, url in enumerate(sample_urls):
-        short_code = generator.generate()
-        
-        # Ensure it's unique before adding to DB
-        while await repository.check_short_code_exists(short_code):
-            short_code = generator.generate()
-        
-        short_codes.add(short_code)
-        await repository.create_url(url, short_code)
+    urls = await repository.create_urls(list(zip(sample_urls, free)))
+    short_codes = {url.short_code for url in urls}
     
     # All codes should be unique
     assert len(short_codes) == len(sample_urls)
 
 
 @pytest.mark.asyncio
-async def test_database_persistence(test_db_session: AsyncSession, fake_redis, sample_urls):
+async def test_database_persistence(url_service, sample_urls):
     """Test that URL mappings are persisted to database."""
-    url_service = URLService(db_session=test_db_session, redis_manager=fake_redis)
-    repository = URLRepository(test_db_session)
+    repository = url_service.repository
     
     original_url = sample_urls[0]
     
@@ -106,7 +106,7 @@ async def test_database_persistence(test_db_session: AsyncSession, fake_redis, s
 @pytest.mark.asyncio
 async def test_short_code_validation():
     """Test short code validation."""
-    generator = ShortCodeGenerator()
+    generator = short_code_generator
     
     # Valid codes
     assert generator.is_valid("aB3xY")
@@ -118,12 +118,14 @@ async def test_short_code_validation():
     assert not generator.is_valid("aB3xY1")  # Too long
     assert not generator.is_valid("aB3x!")  # Invalid character
     assert not generator.is_valid("")  # Empty
+    assert not generator.is_valid("aB3x\u0663")  # Non-ASCII digit
+    assert not URLValidator().is_valid_short_code("aB3x\u0663")
 
 
 @pytest.mark.asyncio
 async def test_base62_encoding():
     """Test Base62 encoding and decoding."""
-    generator = ShortCodeGenerator()
+    generator = short_code_generator
     
     # Test encode/decode cycle
     test_numbers = [0, 1, 100, 1000, 12345, 916132831]
@@ -132,4 +134,322 @@ async def test_base62_encoding():
         encoded = generator.encode_number(num)
         decoded = generator.decode_to_number(encoded)
         assert decoded == num
+    
+    # Characters outside the Base62 set are rejected
+    with pytest.raises(ValueError):
+        generator.decode_to_number("aB3x!")
+
+
+@pytest.mark.asyncio
+async def test_generate_batch():
+    """Test that batch generation returns valid codes."""
+    generator = short_code_generator
+    
+    codes = generator.generate_batch(100)
+    
+    assert len(codes) == 100
+    assert all(generator.is_valid(code) for code in codes)
+
+
+
+@pytest.mark.asyncio
+async def test_create_urls_batch(test_db_session: AsyncSession, sample_urls):
+    """Test that a batch insert creates all mappings in input order."""
+    repository = URLRepository(test_db_session)
+    pairs = [(url, f"BAT{i:02d}") for i, url in enumerate(sample_urls)]
+    
+    urls = await repository.create_urls(pairs)
+    
+    assert [(u.original_url, u.short_code) for u in urls] == pairs
+    assert all(u.id is not None and u.click_count == 0 for u in urls)
+
 
+@pytest.mark.asyncio
+async def test_upsert_url_returns_existing_row(test_db_session: AsyncSession, sample_urls):
+    """Test that upserting a stored URL returns its row and a taken code returns None."""
+    repository = URLRepository(test_db_session)
+    
+    created = await repository.upsert_url(sample_urls[0], "UPS01")
+    existing = await repository.upsert_url(sample_urls[0], "UPS02")
+    
+    assert existing.id == created.id
+    assert existing.short_code == "UPS01"
+    
+    await test_db_session.commit()
+    assert await repository.upsert_url(sample_urls[1], "UPS01") is None
+
+
+@pytest.mark.asyncio
+async def test_batch_writer_coalesces_concurrent_inserts(test_engine, monkeypatch, sample_urls):
+    """Test that concurrent submissions are written and duplicates resolve to one row."""
+    monkeypatch.setattr(
+        database_manager,
+        "_session_factory",
+        async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    writer = URLBatchWriter()
+    writer.start()
+    try:
+        results = await asyncio.gather(
+            writer.submit(sample_urls[0], "WRT01"),
+            writer.submit(sample_urls[1], "WRT02"),
+            writer.submit(sample_urls[0], "WRT03"),  # same URL, different code
+        )
+    finally:
+        await writer.stop()
+    
+    assert results[0].short_code == "WRT01"
+    assert results[1].short_code == "WRT02"
+    assert results[2].short_code == "WRT01"
+
+
+@pytest.mark.asyncio
+async def test_batch_writer_stop_writes_in_flight_batch(test_engine, monkeypatch, sample_urls):
+    """Test that stopping during the batch window still writes the held items."""
+    monkeypatch.setattr(
+        database_manager,
+        "_session_factory",
+        async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    monkeypatch.setattr(settings, "SHORTEN_BATCH_WINDOW_MS", 50)
+    writer = URLBatchWriter()
+    writer.start()
+    
+    submissions = [
+        asyncio.create_task(writer.submit(sample_urls[0], "STP01")),
+        asyncio.create_task(writer.submit(sample_urls[1], "STP02")),
+    ]
+    # Let the consumer take the first item and start waiting out the window
+    await asyncio.sleep(0.01)
+    await writer.stop()
+    
+    results = await asyncio.wait_for(asyncio.gather(*submissions), timeout=1)
+    assert [url.short_code for url in results] == ["STP01", "STP02"]
+    assert not writer.running
+
+
+@pytest.mark.asyncio
+async def test_batched_create_caches_stored_code(
+    test_db_session: AsyncSession,
+    test_engine,
+    fake_redis,
+    monkeypatch,
+    sample_urls
+):
+    """Test that the batched path caches the stored code and drops an unused one."""
+    monkeypatch.setattr(
+        database_manager,
+        "_session_factory",
+        async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    writer = URLBatchWriter()
+    writer.start()
+    try:
+        url_service = URLService(
+            db_session=test_db_session,
+            redis_manager=redis_manager,
+            batch_writer=writer
+        )
+        first = await url_service.create_short_url(sample_urls[0])
+        second = await url_service.create_short_url(sample_urls[0])
+    finally:
+        await writer.stop()
+    
+    assert second.short_code == first.short_code
+    assert await fake_redis.get(f"url:short:{first.short_code}") == sample_urls[0]
+    assert await fake_redis.keys("url:short:*") == [f"url:short:{first.short_code}"]
+
+
+@pytest.mark.asyncio
+async def test_batched_create_replaces_not_found_marker(
+    test_db_session: AsyncSession,
+    test_engine,
+    fake_redis,
+    monkeypatch,
+    sample_urls
+):
+    """Test that a code looked up before it was issued resolves once created."""
+    monkeypatch.setattr(settings, "SHORT_CODE_STRATEGY", "sequence")
+    monkeypatch.setattr(
+        database_manager,
+        "_session_factory",
+        async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    url_service = URLService(db_session=test_db_session, redis_manager=redis_manager)
+    next_code = short_code_generator.generate_from_number(1)
+    
+    # Caches a not-found marker for the next sequence code
+    with pytest.raises(URLNotFoundException):
+        await url_service.get_original_url(next_code)
+    
+    writer = URLBatchWriter()
+    writer.start()
+    try:
+        url_service.batch_writer = writer
+        url = await url_service.create_short_url(sample_urls[0])
+    finally:
+        await writer.stop()
+    
+    assert url.short_code == next_code
+    assert await url_service.get_original_url(next_code) == sample_urls[0]
+
+
+@pytest.mark.asyncio
+async def test_batched_create_retries_taken_code(
+    test_db_session: AsyncSession,
+    test_engine,
+    fake_redis,
+    monkeypatch,
+    sample_urls
+):
+    """Test that the batched path replaces a short code that is already stored."""
+    monkeypatch.setattr(settings, "SHORT_CODE_STRATEGY", "sequence")
+    monkeypatch.setattr(
+        database_manager,
+        "_session_factory",
+        async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    repository = URLRepository(test_db_session)
+    taken_code = short_code_generator.generate_from_number(2)
+    
+    # Row with id 1 holds the code the seeded sequence hands out next
+    await repository.create_url(sample_urls[1], taken_code)
+    await test_db_session.commit()
+    
+    writer = URLBatchWriter()
+    writer.start()
+    try:
+        url_service = URLService(
+            db_session=test_db_session,
+            redis_manager=redis_manager,
+            batch_writer=writer
+        )
+        url = await url_service.create_short_url(sample_urls[0])
+    finally:
+        await writer.stop()
+    
+    assert url.short_code == short_code_generator.generate_from_number(3)
+    assert await fake_redis.get(f"url:short:{taken_code}") is None
+    assert await url_service.get_original_url(url.short_code) == sample_urls[0]
+
+
+@pytest.mark.asyncio
+async def test_sequence_short_codes(url_service, monkeypatch, sample_urls):
+    """Test that short codes are allocated from the Redis sequence."""
+    monkeypatch.setattr(settings, "SHORT_CODE_STRATEGY", "sequence")
+    generator = short_code_generator
+    
+    first = await url_service.create_short_url(sample_urls[0])
+    second = await url_service.create_short_url(sample_urls[1])
+    
+    assert first.short_code == generator.generate_from_number(1)
+    assert second.short_code == generator.generate_from_number(2)
+    
+    # A stored code is skipped by retrying with the next number
+    repository = url_service.repository
+    await repository.create_url(sample_urls[3], generator.generate_from_number(3))
+    third = await url_service.create_short_url(sample_urls[2])
+    assert third.short_code == generator.generate_from_number(4)
+
+
+@pytest.mark.asyncio
+async def test_sequence_is_seeded_past_stored_rows(url_service, monkeypatch, sample_urls):
+    """Test that a fresh sequence counter starts after the highest stored id."""
+    for url in sample_urls[:2]:
+        await url_service.create_short_url(url)
+    
+    monkeypatch.setattr(settings, "SHORT_CODE_STRATEGY", "sequence")
+    url = await url_service.create_short_url(sample_urls[2])
+    
+    assert url.short_code == short_code_generator.generate_from_number(3)
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_and_resolve(url_service, fake_redis, sample_urls):
+    """Test that URLs can be shortened and resolved in bulk."""
+    created = await url_service.create_short_urls(sample_urls + [sample_urls[0]])
+    
+    assert [url.original_url for url in created] == sample_urls + [sample_urls[0]]
+    assert created[-1].short_code == created[0].short_code
+    assert await fake_redis.get(f"url:short:{created[1].short_code}") == sample_urls[1]
+    
+    # Resolve through the database after the Redis cache is emptied
+    await fake_redis.delete(f"url:short:{created[2].short_code}")
+    codes = [url.short_code for url in created[:3]] + ["XXXXX"]
+    resolved = await url_service.get_original_urls(codes)
+    
+    assert resolved == {url.short_code: url.original_url for url in created[:3]}
+
+
+@pytest.mark.asyncio
+async def test_random_codes_come_from_pool(
+    url_service,
+    test_engine,
+    fake_redis,
+    monkeypatch,
+    sample_urls
+):
+    """Test that the random strategy takes pre-checked codes from the Redis pool."""
+    monkeypatch.setattr(
+        database_manager,
+        "_session_factory",
+        async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    monkeypatch.setattr(settings, "SHORT_CODE_STRATEGY", "random")
+    monkeypatch.setattr(settings, "SHORT_CODE_POOL_SIZE", 10)
+    
+    assert await ShortCodePool().refill() == 10
+    pooled = await fake_redis.lrange(CODE_POOL_KEY, 0, -1)
+    
+    url = await url_service.create_short_url(sample_urls[0])
+    
+    assert url.short_code == pooled[0]
+    assert await fake_redis.llen(CODE_POOL_KEY) == 9
+
+
+@pytest.mark.asyncio
+async def test_random_code_rejects_locally_cached_codes(url_service, monkeypatch, sample_urls):
+    """Test that locally cached random codes are redrawn without a database query."""
+    monkeypatch.setattr(settings, "SHORT_CODE_STRATEGY", "random")
+    monkeypatch.setattr(settings, "SHORT_CODE_POOL_SIZE", 0)
+    
+    batches = iter([["taken"], ["taken", "fresh"]])
+    monkeypatch.setattr(url_service.generator, "generate_batch", lambda count: next(batches))
+    local_url_cache["taken"] = sample_urls[0]
+    
+    queried: list[list[str]] = []
+    filter_existing = url_service.repository.filter_existing_short_codes
+    
+    async def record_query(short_codes):
+        queried.append(short_codes)
+        return await filter_existing(short_codes)
+    
+    monkeypatch.setattr(url_service.repository, "filter_existing_short_codes", record_query)
+    
+    assert await url_service._generate_unique_short_code() == "fresh"
+    assert queried == [["fresh"]]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_retries_taken_code(url_service, monkeypatch, sample_urls):
+    """Test that a taken random code in a bulk create is replaced with a new one."""
+    monkeypatch.setattr(settings, "SHORT_CODE_STRATEGY", "random")
+    monkeypatch.setattr(settings, "SHORT_CODE_POOL_SIZE", 0)
+    
+    taken_code = (await url_service.create_short_url(sample_urls[0])).short_code
+    await url_service.repository.session.commit()
+    
+    # Only the bulk allocation draws the taken code; retries draw real ones
+    generate_batch = url_service.generator.generate_batch
+    batches = iter([[taken_code, "fresh"]])
+    monkeypatch.setattr(
+        url_service.generator,
+        "generate_batch",
+        lambda count: next(batches, None) or generate_batch(count)
+    )
+    created = await url_service.create_short_urls(sample_urls[1:3])
+    
+    assert [url.original_url for url in created] == sample_urls[1:3]
+    assert taken_code not in {url.short_code for url in created}
+    for url in created:
+        assert await url_service.get_original_url(url.short_code) == url.original_url